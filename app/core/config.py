@@ -1,9 +1,12 @@
 import os
-import json
+import asyncio
 import logging
 import re
+import heapq
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
+from app.core import serialization
 
 # 加载环境变量，支持从项目根目录加载.env文件
 dotenv_path = Path(__file__).parent.parent.parent / ".env"
@@ -20,6 +23,69 @@ logger = logging.getLogger(__name__)
 logger.info(f".env文件路径: {dotenv_path}")
 logger.info(f".env文件存在: {dotenv_path.exists()}")
 
+# 支持多种分隔符：英文逗号、中文全角逗号、空格、换行
+_TOKEN_SPLIT_RE = re.compile(r'[,，\s\n]+')
+
+def _parse_tokens(raw_tokens):
+    """将环境变量中的多个 Token 拆分为列表"""
+    return [t.strip() for t in _TOKEN_SPLIT_RE.split(raw_tokens) if t.strip()]
+
+# 已解析配置文件缓存: {path: ((st_mtime_ns, st_size), value)}
+_file_cache = {}
+
+def _file_key(path):
+    """文件版本标识，文件不存在时返回 None"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _cached_load(path, loader):
+    """按 mtime 缓存文件解析结果，文件未变化时直接返回缓存"""
+    key = _file_key(path)
+    if key is None:
+        _file_cache.pop(path, None)
+        return None
+    entry = _file_cache.get(path)
+    if entry and entry[0] == key:
+        return entry[1]
+    value = loader(path)
+    _file_cache[path] = (key, value)
+    return value
+
+def _update_cache(path, value):
+    """写入文件后就地更新缓存，避免下次读取时重新解析"""
+    key = _file_key(path)
+    if key is None:
+        _file_cache.pop(path, None)
+    else:
+        _file_cache[path] = (key, value)
+
+def _atomic_write(path, data: bytes):
+    """先写临时文件再原子替换，读取方不会看到写了一半的文件"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _read_json(path):
+    with open(path, 'rb') as f:
+        return serialization.loads(f.read())
+
+def _count_lines(path):
+    """统计文件行数（含重复行），文件不存在时返回 0"""
+    try:
+        with open(path, 'rb') as f:
+            return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+    except FileNotFoundError:
+        return 0
+
+def _read_id_log(path):
+    # 推文 ID 以 int 形式保存在内存中，比 str 更省内存
+    with open(path, 'r', encoding='utf-8') as f:
+        return {int(line) for line in f if line.strip().isdigit()}
+
 class Config:
     # 基础路径
     BASE_DIR = Path(__file__).parent.parent.parent
@@ -38,9 +104,7 @@ class Config:
     # 改进Token解析逻辑，确保正确处理各种分隔符
     TWITTER_BEARER_TOKEN = []
     if _raw_tokens:
-        # 支持多种分隔符：英文逗号、中文全角逗号、空格、换行
-        tokens = re.split(r'[,，\s\n]+', _raw_tokens)
-        TWITTER_BEARER_TOKEN = [t.strip() for t in tokens if t.strip()]
+        TWITTER_BEARER_TOKEN = _parse_tokens(_raw_tokens)
         logger.info(f"解析后的Bearer Token数量: {len(TWITTER_BEARER_TOKEN)}")
         logger.info(f"解析后的Bearer Token列表: {TWITTER_BEARER_TOKEN}")
     else:
@@ -71,105 +135,283 @@ class Config:
     # 全局采集用户列表
     GLOBAL_USERS_FILE = CONFIG_DIR / "users.json"
     
-    # 已处理推文 ID 记录
-    PROCESSED_IDS_FILE = DATA_DIR / "processed_ids.json"
+    # 已处理推文 ID 记录（追加写日志，每行一个 ID）
+    PROCESSED_IDS_FILE = DATA_DIR / "processed_ids.log"
+    # 旧版 JSON 数组格式，加载时自动迁移
+    LEGACY_PROCESSED_IDS_FILE = DATA_DIR / "processed_ids.json"
+    # 追加次数达到该值后压缩一次日志（长驻进程）；短进程在首次加载时按行数压缩
+    PROCESSED_IDS_COMPACT_EVERY = 1000
+    # 压缩时最多保留的 ID 数（推文 ID 随时间递增，保留最大的即最新的）
+    PROCESSED_IDS_MAX = int(os.getenv("PROCESSED_IDS_MAX", 100000))
+    _processed_ids_appends = 0
+    # 进程内共享的已处理 ID 集合
+    _PROCESSED_IDS = None
+    # 追加在 to_thread 线程池中执行，需与压缩的原子替换串行，否则替换后追加到旧文件的 ID 会丢失
+    _processed_ids_lock = threading.RLock()
+    
+    # 关注列表快照记录（按用户分片: following/{user_id}.json）
+    FOLLOWING_SNAPSHOT_DIR = DATA_DIR / "following"
+    # 旧版单文件快照，加载时自动迁移
+    LEGACY_FOLLOWING_SNAPSHOT_FILE = DATA_DIR / "following_snapshot.json"
     
-    # 关注列表快照记录
-    FOLLOWING_SNAPSHOT_FILE = DATA_DIR / "following_snapshot.json"
+    # Discord 用户订阅文件列表缓存: (DATA_DIR 版本标识, 文件列表)
+    _dc_files_cache = None
+    # Discord 用户订阅索引缓存: (各文件版本标识, 索引)
+    _dc_index_cache = None
     
     # 队列系统配置
     QUEUE_CONFIG = {
         "twitter_api": {
             "max_tokens": 15,  # 15 requests / 15 minutes
-            "refill_interval": 900  # 15 minutes in seconds
+            "refill_interval": 900,  # 15 minutes in seconds
+            "workers": 2
         },
         "discord_bot": {
             "max_tokens": 5,     # 5 messages / second
-            "refill_interval": 1  # 1 second
+            "refill_interval": 1,  # 1 second
+            "workers": 5
         },
         "webhook_push": {
             "max_tokens": 3,      # 3 webhooks / second
-            "refill_interval": 1   # 1 second
+            "refill_interval": 1,  # 1 second
+            "workers": 3
         }
     }
 
+    @classmethod
+    def reload_tokens(cls):
+        """重新读取 TWITTER_BEARER_TOKEN 环境变量，用于 Token 热更新"""
+        cls.TWITTER_BEARER_TOKEN = _parse_tokens(os.getenv("TWITTER_BEARER_TOKEN", ""))
+        logger.info(f"重新加载 Bearer Token 数量: {len(cls.TWITTER_BEARER_TOKEN)}")
+        return cls.TWITTER_BEARER_TOKEN
+
     @classmethod
     def get_global_users(cls):
         """获取全局订阅用户列表"""
-        if not cls.GLOBAL_USERS_FILE.exists():
-            return []
         try:
-            with open(cls.GLOBAL_USERS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _cached_load(cls.GLOBAL_USERS_FILE, _read_json) or []
         except Exception as e:
             logging.error(f"无法读取全局用户配置文件: {e}")
             return []
 
+    @classmethod
+    def _dc_user_files(cls):
+        """Discord 用户订阅文件列表，按 DATA_DIR 的 mtime 缓存"""
+        dir_key = _file_key(cls.DATA_DIR)
+        if cls._dc_files_cache is None or cls._dc_files_cache[0] != dir_key:
+            cls._dc_files_cache = (dir_key, sorted(cls.DATA_DIR.glob("users_dc_*.json")))
+        return cls._dc_files_cache[1]
+
     @classmethod
     def get_dc_user_configs(cls):
         """获取所有 Discord 用户的订阅配置"""
         configs = []
-        for file in cls.DATA_DIR.glob("users_dc_*.json"):
+        for file in cls._dc_user_files():
             try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    configs.append({
-                        "id": file.stem.replace("users_dc_", ""),
-                        "users": json.load(f)
-                    })
+                users = _cached_load(file, _read_json)
+                if users is None:
+                    continue
+                configs.append({
+                    "id": file.stem.replace("users_dc_", ""),
+                    # 浅拷贝，调用方增删订阅不会污染缓存
+                    "users": list(users)
+                })
             except Exception as e:
                 logging.error(f"无法读取用户配置 {file.name}: {e}")
         return configs
 
+    @classmethod
+    def get_dc_user_index(cls):
+        """获取订阅索引 {discord_id: {小写用户名: 订阅项}}（共享缓存，调用方不应修改）"""
+        version = tuple((file, _file_key(file)) for file in cls._dc_user_files())
+        if cls._dc_index_cache is not None and cls._dc_index_cache[0] == version:
+            return cls._dc_index_cache[1]
+
+        index = {
+            config["id"]: {u["username"].lower(): u for u in config["users"]}
+            for config in cls.get_dc_user_configs()
+        }
+        cls._dc_index_cache = (version, index)
+        return index
+
     @classmethod
     def save_dc_user_config(cls, user_id, users):
         """保存特定 Discord 用户的订阅配置"""
         file_path = cls.DATA_DIR / f"users_dc_{user_id}.json"
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(users, f, indent=2, ensure_ascii=False)
+            _atomic_write(file_path, serialization.dumps(users, indent=True))
+            _update_cache(file_path, list(users))
             return True
         except Exception as e:
             logging.error(f"无法保存用户配置 {user_id}: {e}")
             return False
 
+    @classmethod
+    def processed_ids(cls):
+        """进程内共享的已处理 ID 集合，首次访问时从磁盘加载，日志超过上限时先压缩"""
+        with cls._processed_ids_lock:
+            if cls._PROCESSED_IDS is None:
+                # 追加计数只在进程内有效，CI 等短进程可能永远达不到，因此加载时按行数判断
+                if _count_lines(cls.PROCESSED_IDS_FILE) > cls.PROCESSED_IDS_MAX:
+                    cls.compact_processed_ids()
+                # 与文件缓存使用不同的集合对象，二者由追加与压缩同步更新
+                cls._PROCESSED_IDS = set(cls.load_processed_ids())
+            return cls._PROCESSED_IDS
+
     @classmethod
     def load_processed_ids(cls):
-        """加载已处理的推文 ID"""
-        if not cls.PROCESSED_IDS_FILE.exists():
-            return set()
+        """加载已处理的推文 ID（int 集合，兼容旧版 JSON 文件）"""
+        if cls.LEGACY_PROCESSED_IDS_FILE.exists():
+            cls._migrate_legacy_processed_ids()
         try:
-            with open(cls.PROCESSED_IDS_FILE, 'r', encoding='utf-8') as f:
-                return set(json.load(f))
+            processed_ids = _cached_load(cls.PROCESSED_IDS_FILE, _read_id_log)
         except Exception as e:
             logging.error(f"无法读取已处理 ID 文件: {e}")
             return set()
+        return processed_ids if processed_ids is not None else set()
 
     @classmethod
-    def save_processed_ids(cls, processed_ids):
-        """保存已处理的推文 ID"""
+    def _migrate_legacy_processed_ids(cls):
+        """将旧版 JSON 数组迁移到追加写日志"""
+        processed_ids = set()
         try:
-            with open(cls.PROCESSED_IDS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(list(processed_ids), f, indent=2, ensure_ascii=False)
+            processed_ids.update(int(x) for x in _read_json(cls.LEGACY_PROCESSED_IDS_FILE))
+            if cls.PROCESSED_IDS_FILE.exists():
+                processed_ids.update(_read_id_log(cls.PROCESSED_IDS_FILE))
         except Exception as e:
-            logging.error(f"无法保存已处理 ID 文件: {e}")
+            logging.error(f"无法读取旧版已处理 ID 文件: {e}")
+            return
+        cls.save_processed_ids(processed_ids)
+
+    @classmethod
+    def append_processed_id(cls, tweet_id):
+        """追加一条已处理的推文 ID，只写入新增部分"""
+        with cls._processed_ids_lock:
+            try:
+                with open(cls.PROCESSED_IDS_FILE, 'a', encoding='utf-8') as f:
+                    f.write(f"{tweet_id}\n")
+            except Exception as e:
+                logging.error(f"无法追加已处理 ID: {e}")
+                return
+            if cls._PROCESSED_IDS is not None:
+                cls._PROCESSED_IDS.add(int(tweet_id))
+            entry = _file_cache.get(cls.PROCESSED_IDS_FILE)
+            if entry:
+                entry[1].add(int(tweet_id))
+                _update_cache(cls.PROCESSED_IDS_FILE, entry[1])
+            cls._processed_ids_appends += 1
+            if cls._processed_ids_appends >= cls.PROCESSED_IDS_COMPACT_EVERY:
+                cls.compact_processed_ids()
+
+    @classmethod
+    def compact_processed_ids(cls):
+        """压缩已处理 ID 日志，去除重复行并只保留最新的 PROCESSED_IDS_MAX 个"""
+        with cls._processed_ids_lock:
+            processed_ids = set(cls.load_processed_ids())
+            if len(processed_ids) > cls.PROCESSED_IDS_MAX:
+                processed_ids = set(heapq.nlargest(cls.PROCESSED_IDS_MAX, processed_ids))
+            cls.save_processed_ids(processed_ids)
+            # 文件缓存已由 save_processed_ids 刷新，内存集合同步为相同内容（原地更新，调用方持有引用）
+            if cls._PROCESSED_IDS is not None:
+                cls._PROCESSED_IDS.intersection_update(processed_ids)
+                cls._PROCESSED_IDS.update(processed_ids)
+
+    @classmethod
+    def save_processed_ids(cls, processed_ids):
+        """全量重写已处理的推文 ID（用于压缩与迁移）"""
+        with cls._processed_ids_lock:
+            try:
+                data = "".join(f"{tweet_id}\n" for tweet_id in sorted(processed_ids)).encode('utf-8')
+                _atomic_write(cls.PROCESSED_IDS_FILE, data)
+                cls.LEGACY_PROCESSED_IDS_FILE.unlink(missing_ok=True)
+                cls._processed_ids_appends = 0
+                if not isinstance(processed_ids, set):
+                    processed_ids = set(processed_ids)
+                _update_cache(cls.PROCESSED_IDS_FILE, processed_ids)
+            except Exception as e:
+                logging.error(f"无法保存已处理 ID 文件: {e}")
 
     @classmethod
     def load_following_snapshots(cls):
-        """加载关注列表快照"""
-        if not cls.FOLLOWING_SNAPSHOT_FILE.exists():
-            return {}
+        """加载所有用户的关注列表快照"""
+        if cls.LEGACY_FOLLOWING_SNAPSHOT_FILE.exists():
+            cls._migrate_legacy_following_snapshots()
+        snapshots = {}
+        if not cls.FOLLOWING_SNAPSHOT_DIR.exists():
+            return snapshots
+        for file in cls.FOLLOWING_SNAPSHOT_DIR.glob("*.json"):
+            try:
+                snapshot = _cached_load(file, _read_json)
+                if snapshot is not None:
+                    snapshots[file.stem] = snapshot
+            except Exception as e:
+                logging.error(f"无法读取关注快照文件 {file.name}: {e}")
+        return snapshots
+
+    @classmethod
+    def _migrate_legacy_following_snapshots(cls):
+        """将旧版单文件快照拆分为按用户分片"""
         try:
-            with open(cls.FOLLOWING_SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            snapshots = _read_json(cls.LEGACY_FOLLOWING_SNAPSHOT_FILE)
         except Exception as e:
-            logging.error(f"无法读取关注快照文件: {e}")
-            return {}
+            logging.error(f"无法读取旧版关注快照文件: {e}")
+            return
+        if cls.save_following_snapshots(snapshots):
+            cls.LEGACY_FOLLOWING_SNAPSHOT_FILE.unlink(missing_ok=True)
 
     @classmethod
-    def save_following_snapshots(cls, snapshots):
-        """保存关注列表快照"""
+    def save_following_snapshot(cls, user_id, following_ids):
+        """保存单个用户的关注列表快照，只重写该用户的分片（接受 set，排序后写入便于 diff）"""
+        file_path = cls.FOLLOWING_SNAPSHOT_DIR / f"{user_id}.json"
+        following_ids = sorted(following_ids)
         try:
-            with open(cls.FOLLOWING_SNAPSHOT_FILE, 'w', encoding='utf-8') as f:
-                json.dump(snapshots, f, indent=2, ensure_ascii=False)
+            cls.FOLLOWING_SNAPSHOT_DIR.mkdir(exist_ok=True)
+            _atomic_write(file_path, serialization.dumps(following_ids, indent=True))
+            _update_cache(file_path, following_ids)
+            return True
         except Exception as e:
-            logging.error(f"无法保存关注快照文件: {e}")
+            logging.error(f"无法保存关注快照 {user_id}: {e}")
+            return False
+
+    @classmethod
+    def save_following_snapshots(cls, snapshots):
+        """保存所有用户的关注列表快照"""
+        results = [cls.save_following_snapshot(user_id, ids) for user_id, ids in snapshots.items()]
+        return all(results)
+
+    # 异步版本：在线程中执行文件 I/O，供事件循环中的调用方使用
+    @classmethod
+    async def aget_global_users(cls):
+        return await asyncio.to_thread(cls.get_global_users)
+
+    @classmethod
+    async def aget_dc_user_configs(cls):
+        return await asyncio.to_thread(cls.get_dc_user_configs)
+
+    @classmethod
+    async def aget_dc_user_index(cls):
+        return await asyncio.to_thread(cls.get_dc_user_index)
+
+    @classmethod
+    async def asave_dc_user_config(cls, user_id, users):
+        return await asyncio.to_thread(cls.save_dc_user_config, user_id, users)
+
+    @classmethod
+    async def aload_processed_ids(cls):
+        return await asyncio.to_thread(cls.load_processed_ids)
+
+    @classmethod
+    async def aappend_processed_id(cls, tweet_id):
+        await asyncio.to_thread(cls.append_processed_id, tweet_id)
+
+    @classmethod
+    async def aload_following_snapshots(cls):
+        return await asyncio.to_thread(cls.load_following_snapshots)
+
+    @classmethod
+    async def asave_following_snapshot(cls, user_id, following_ids):
+        return await asyncio.to_thread(cls.save_following_snapshot, user_id, following_ids)
+
+    @classmethod
+    async def asave_following_snapshots(cls, snapshots):
+        return await asyncio.to_thread(cls.save_following_snapshots, snapshots)
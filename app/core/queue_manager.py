@@ -27,8 +27,8 @@ class QueueManager:
         }
         
         # 令牌桶存储
-        self.tokens: Dict[str, int] = {
-            queue_type: self.rate_limits[queue_type][0] for queue_type in self.queue_types
+        self.tokens: Dict[str, float] = {
+            queue_type: float(self.rate_limits[queue_type][0]) for queue_type in self.queue_types
         }
         
         # 最后补充令牌时间
@@ -50,10 +50,12 @@ class QueueManager:
         logger.info("队列管理器启动中...")
         self.is_running = True
         
-        # 为每个队列启动一个处理器任务
+        # 为每个队列启动多个处理器任务，共享同一个队列和令牌桶
         for queue_type in self.queue_types:
-            task = asyncio.create_task(self._process_queue(queue_type))
-            self.tasks.append(task)
+            workers = Config.QUEUE_CONFIG[queue_type].get("workers", 1)
+            for _ in range(workers):
+                task = asyncio.create_task(self._process_queue(queue_type))
+                self.tasks.append(task)
         
         logger.info("队列管理器已启动")
     
@@ -78,35 +80,34 @@ class QueueManager:
         logger.info("队列管理器已停止")
     
     async def _refill_tokens(self, queue_type: str):
-        """补充令牌桶中的令牌"""
+        """按经过的时间连续补充令牌（保留小数部分，避免取整丢失令牌）"""
         now = asyncio.get_event_loop().time()
-        elapsed = now - self.last_refill[queue_type]
+        max_tokens, refill_interval = self.rate_limits[queue_type]
+        rate = max_tokens / refill_interval
         
+        elapsed = now - self.last_refill[queue_type]
         if elapsed > 0:
-            # 获取速率限制配置
-            max_tokens, refill_interval = self.rate_limits[queue_type]
-            
-            # 计算可以补充的令牌数
-            tokens_to_add = int(elapsed / refill_interval * max_tokens)
-            
-            if tokens_to_add > 0:
-                # 更新令牌数量
-                self.tokens[queue_type] = min(max_tokens, self.tokens[queue_type] + tokens_to_add)
-                self.last_refill[queue_type] = now
+            self.tokens[queue_type] = min(max_tokens, self.tokens[queue_type] + elapsed * rate)
+            self.last_refill[queue_type] = now
     
     async def _wait_for_token(self, queue_type: str):
         """等待可用令牌"""
         while True:
             await self._refill_tokens(queue_type)
             
-            if self.tokens[queue_type] > 0:
+            if self.tokens[queue_type] >= 1:
                 # 消耗一个令牌
                 self.tokens[queue_type] -= 1
                 return
             
-            # 等待直到下一个令牌可用
-            _, refill_interval = self.rate_limits[queue_type]
-            await asyncio.sleep(refill_interval / self.rate_limits[queue_type][0])
+            # 精确计算距离下一个令牌可用的时间，一次睡眠到位
+            max_tokens, refill_interval = self.rate_limits[queue_type]
+            await asyncio.sleep((1 - self.tokens[queue_type]) * refill_interval / max_tokens)
+    
+    def drain_tokens(self, queue_type: str, delay: float):
+        """外部服务告知限额已耗尽时清空令牌桶，delay 秒后再开始补充"""
+        self.tokens[queue_type] = 0.0
+        self.last_refill[queue_type] = asyncio.get_event_loop().time() + delay
     
     async def add_task(self, queue_type: str, task_func: Callable, *args, **kwargs):
         """
@@ -133,7 +134,7 @@ class QueueManager:
         
         # 添加到队列
         await self.queues[queue_type].put(task)
-        logger.debug(f"已添加任务到 {queue_type} 队列，当前队列大小: {self.queues[queue_type].qsize()}")
+        logger.debug("已添加任务到 %s 队列，当前队列大小: %d", queue_type, self.queues[queue_type].qsize())
     
     async def _process_queue(self, queue_type: str):
         """处理指定队列的任务"""
@@ -141,15 +142,16 @@ class QueueManager:
         
         while self.is_running:
             try:
-                # 等待可用令牌
-                await self._wait_for_token(queue_type)
-                
-                # 从队列获取任务
+                # 先取任务再等待令牌，空队列时不会占用令牌
                 task = await self.queues[queue_type].get()
+                retry_scheduled = False
                 
                 try:
+                    # 等待可用令牌
+                    await self._wait_for_token(queue_type)
+                    
                     # 执行任务
-                    logger.debug(f"执行 {queue_type} 任务，重试次数: {task['retries']}")
+                    logger.debug("执行 %s 任务，重试次数: %d", queue_type, task["retries"])
                     await task["func"](*task["args"], **task["kwargs"])
                 except Exception as e:
                     logger.error(f"执行 {queue_type} 任务失败: {e}")
@@ -157,16 +159,17 @@ class QueueManager:
                     # 重试逻辑
                     task["retries"] += 1
                     if task["retries"] < task["max_retries"]:
-                        # 指数退避
+                        # 指数退避：定时放回队列，退避期间处理器继续处理其他任务
                         wait_time = 2 ** (task["retries"] - 1)
                         logger.info(f"{queue_type} 任务将在 {wait_time} 秒后重试")
-                        await asyncio.sleep(wait_time)
-                        await self.queues[queue_type].put(task)
+                        asyncio.get_running_loop().call_later(wait_time, self._requeue, queue_type, task)
+                        retry_scheduled = True
                     else:
                         logger.error(f"{queue_type} 任务重试次数耗尽")
                 finally:
-                    # 标记任务完成
-                    self.queues[queue_type].task_done()
+                    # 标记任务完成（待重试的任务在重新入队后再标记，保证 join() 不会提前返回）
+                    if not retry_scheduled:
+                        self.queues[queue_type].task_done()
             
             except asyncio.CancelledError:
                 logger.info(f"{queue_type} 队列处理器已取消")
@@ -178,6 +181,11 @@ class QueueManager:
         
         logger.info(f"停止处理 {queue_type} 队列")
     
+    def _requeue(self, queue_type: str, task: Dict):
+        """将待重试任务放回队列"""
+        self.queues[queue_type].put_nowait(task)
+        self.queues[queue_type].task_done()
+    
     def get_queue_size(self, queue_type: str) -> Optional[int]:
         """获取指定队列的大小"""
         if queue_type not in self.queues:
@@ -0,0 +1,26 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 当前使用的 JSON 后端名称，便于日志排查
+BACKEND = "orjson" if orjson else "json"
+
+
+def loads(data):
+    """解析 JSON（支持 bytes / str），优先使用 orjson"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """序列化为 UTF-8 编码的 JSON 字节串，优先使用 orjson"""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
@@ -0,0 +1,30 @@
+import aiohttp
+from typing import Optional
+
+# 进程内共享的 HTTP 会话，所有爬虫实例复用同一个连接池
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """获取共享会话（需在事件循环中调用），首次调用时创建"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=75
+        )
+        _SESSION = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _SESSION
+
+
+async def close_session():
+    """关闭共享会话，在程序退出时调用"""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
@@ -4,33 +4,72 @@ import asyncio
 import aiohttp
 import hmac
 import hashlib
+import heapq
 import base64
+import secrets
 import random
-import string
+import re
 from typing import List, Dict, Optional
+from urllib.parse import quote
 from app.core.config import Config
 from app.core.logger import logger
 from app.core.queue_manager import queue_manager
+from app.core.session import get_session
+
+USER_AGENT = "v2UserTweetsPython"
+# /users/by 接口单次最多查询的用户名数量
+USERS_LOOKUP_BATCH = 100
+# 合法的 X 用户名；批量请求中只要有一个非法用户名，整批都会返回 400
+USERNAME_RE = re.compile(r'^[A-Za-z0-9_]{1,15}$')
+# 网络错误或 5xx 时的最大重试次数（指数退避 + 抖动，不阻塞事件循环）
+MAX_TRANSIENT_RETRIES = 3
+
+def _followers_count(user: Dict) -> int:
+    """排序键：用户粉丝数，缺失时视为 0"""
+    return (user.get("public_metrics") or {}).get("followers_count", 0)
+
+def _is_transient(error: Exception) -> bool:
+    """是否为值得重试的临时错误：连接失败、超时或服务端 5xx"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+def _percent_encode(value) -> str:
+    """OAuth 1.0a 要求的 RFC 3986 百分号编码"""
+    return quote(str(value), safe='')
 
 class XCrawler:
     def __init__(self, bearer_tokens: List[str] = None):
-        # 1. 支持 Bearer Token 认证
-        self.bearer_tokens = bearer_tokens or Config.TWITTER_BEARER_TOKEN
+        # 1. 支持 Bearer Token 认证（初始化时过滤空 Token）
+        self.bearer_tokens = [t.strip() for t in (bearer_tokens or Config.TWITTER_BEARER_TOKEN) if t.strip()]
+        # 为每个 Token 预先构建请求头，轮换时只需切换引用
+        self._headers_by_index = [
+            {"User-Agent": USER_AGENT, "Authorization": f"Bearer {token}"}
+            for token in self.bearer_tokens
+        ]
         
         # 2. 支持 API Key/Secret 认证
         self.api_key = Config.TWITTER_API_KEY
         self.api_secret = Config.TWITTER_API_SECRET
+        # 每次请求都不变的 OAuth 参数
+        self._static_oauth_params = {
+            "oauth_consumer_key": self.api_key,
+            "oauth_signature_method": "HMAC-SHA1",
+            "oauth_version": "1.0"
+        }
+        # OAuth 签名密钥: 编码后的 consumer secret + "&"（应用级认证无 token secret）
+        self._signing_key = f"{_percent_encode(self.api_secret or '')}&".encode()
         
         # 认证方式
         self.auth_type = "bearer" if self.bearer_tokens else ("oauth1" if self.api_key and self.api_secret else None)
         
         self.token_index = 0
         self.base_url = "https://api.twitter.com/2"
+        # 批量查询时的最大并发请求数
+        self.max_concurrency = int(os.getenv("TWITTER_MAX_CONCURRENCY", 5))
         # 代理配置
         self.proxies = self._get_proxies()
         self._update_headers()
-        # 会话对象
-        self.session = None
 
     def _get_proxies(self):
         """从环境变量获取代理配置"""
@@ -44,37 +83,32 @@ class XCrawler:
         return proxies
 
     def _generate_nonce(self):
-        """生成随机字符串用于OAuth 1.0a"""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=32))
+        """生成随机字符串用于OAuth 1.0a（32 字符，来自 os.urandom）"""
+        return secrets.token_urlsafe(24)
 
     def _generate_oauth_signature(self, url, params, method="GET"):
         """生成OAuth 1.0a签名"""
         # 准备签名基础字符串
         oauth_params = {
-            "oauth_consumer_key": self.api_key,
+            **self._static_oauth_params,
             "oauth_nonce": self._generate_nonce(),
-            "oauth_signature_method": "HMAC-SHA1",
-            "oauth_timestamp": str(int(time.time())),
-            "oauth_version": "1.0"
+            "oauth_timestamp": str(int(time.time()))
         }
         
         # 合并所有参数
         all_params = {**oauth_params, **params}
         
-        # 排序参数
-        sorted_params = sorted(all_params.items())
+        # 先百分号编码再排序（RFC 5849 3.4.1.3.2）
+        encoded_params = sorted((_percent_encode(k), _percent_encode(v)) for k, v in all_params.items())
         
         # 构建参数字符串
-        param_string = '&'.join([f"{k}={v}" for k, v in sorted_params])
+        param_string = '&'.join(f"{k}={v}" for k, v in encoded_params)
         
         # 构建基础字符串
-        base_string = f"{method}&{base64.b64encode(url.encode()).decode()}&{base64.b64encode(param_string.encode()).decode()}"
-        
-        # 构建签名密钥
-        signing_key = f"{self.api_secret}&"
+        base_string = f"{method.upper()}&{_percent_encode(url)}&{_percent_encode(param_string)}"
         
-        # 生成签名
-        signature = hmac.new(signing_key.encode(), base_string.encode(), hashlib.sha1).digest()
+        # 生成签名（签名密钥在初始化时预先构建）
+        signature = hmac.new(self._signing_key, base_string.encode(), hashlib.sha1).digest()
         oauth_params["oauth_signature"] = base64.b64encode(signature).decode()
         
         return oauth_params
@@ -82,71 +116,79 @@ class XCrawler:
     def _build_oauth_header(self, url, params, method="GET"):
         """构建OAuth 1.0a请求头"""
         oauth_params = self._generate_oauth_signature(url, params, method)
-        oauth_header = "OAuth " + ", ".join([f"{k}=\"{v}\"" for k, v in oauth_params.items()])
+        oauth_header = "OAuth " + ", ".join([f"{_percent_encode(k)}=\"{_percent_encode(v)}\"" for k, v in oauth_params.items()])
         return oauth_header
 
     def _update_headers(self):
         """更新当前使用的认证请求头"""
-        self.headers = {
-            "User-Agent": "v2UserTweetsPython"
-        }
-        
         if self.auth_type == "bearer":
-            if not self.bearer_tokens or not self.bearer_tokens[0]:
-                logger.error("未配置有效的 TWITTER_BEARER_TOKEN")
-                return
-            
-            current_token = self.bearer_tokens[self.token_index].strip()
-            self.headers["Authorization"] = f"Bearer {current_token}"
-            logger.debug(f"当前使用 Bearer Token 索引: {self.token_index}")
+            self.headers = self._headers_by_index[self.token_index]
         elif self.auth_type == "oauth1":
             # OAuth 1.0a 认证的头信息在每次请求时动态生成
-            logger.debug("使用 OAuth 1.0a 认证")
+            self.headers = {"User-Agent": USER_AGENT}
         else:
+            self.headers = {"User-Agent": USER_AGENT}
             logger.error("未配置有效的 Twitter API 认证信息")
 
     def _rotate_token(self):
         """轮换到下一个 Token"""
         if self.auth_type == "bearer" and len(self.bearer_tokens) > 1:
             self.token_index = (self.token_index + 1) % len(self.bearer_tokens)
-            self._update_headers()
+            self.headers = self._headers_by_index[self.token_index]
             logger.info(f"已轮换到下一个 Twitter Bearer Token (索引: {self.token_index})")
 
-    async def _get_request(self, url: str, params: Dict = None, retry_count: int = 0):
-        """通用异步请求处理，包含速率限制检查和 Token 轮换"""
+    @staticmethod
+    def _rate_limit_wait(headers) -> int:
+        """根据 x-rate-limit-reset 响应头计算需要等待的秒数，缺失时默认 15 分钟"""
+        try:
+            reset = int(headers.get("x-rate-limit-reset", 0))
+        except (TypeError, ValueError):
+            reset = 0
+        if not reset:
+            return 15 * 60
+        return max(1, reset - int(time.time()))
+
+    async def _get_request(self, url: str, params: Dict = None, retry_count: int = 0, attempt: int = 0):
+        """通用异步请求处理，包含速率限制检查、Token 轮换和临时错误重试"""
         if not self.auth_type:
             logger.error("未配置有效的认证方式")
             return None
 
         try:
-            if self.session is None:
-                self.session = aiohttp.ClientSession()
+            session = get_session()
             
-            # 准备请求头
-            request_headers = self.headers.copy()
+            # 准备请求头（Bearer 模式直接使用预构建的请求头）
+            request_headers = self.headers
             
             # 根据认证类型处理请求头
             if self.auth_type == "oauth1":
                 # 为每个请求构建 OAuth 1.0a 头
                 oauth_header = self._build_oauth_header(url, params or {})
-                request_headers["Authorization"] = oauth_header
+                request_headers = {**self.headers, "Authorization": oauth_header}
             
-            async with self.session.get(url, headers=request_headers, params=params, proxy=self.proxies.get("https"), timeout=10) as response:
-                # 处理速率限制
-                if response.status == 429:
-                    if self.auth_type == "bearer" and retry_count < len(self.bearer_tokens):
-                        logger.warning(f"Token {self.token_index} 触发速率限制，正在尝试轮换...")
-                        self._rotate_token()
-                        return await self._get_request(url, params, retry_count + 1)
-                    else:
-                        wait_time = 15 * 60
-                        logger.warning(f"所有认证方式均已达到限制，等待 15 分钟...")
-                        await asyncio.sleep(wait_time)
-                        return await self._get_request(url, params, 0)
+            async with session.get(url, headers=request_headers, params=params, proxy=self.proxies.get("https")) as response:
+                if response.status != 429:
+                    response.raise_for_status()
+                    return await response.json()
+                wait_time = self._rate_limit_wait(response.headers)
+
+            # 处理速率限制（连接已释放，等待期间不占用连接池）
+            if self.auth_type == "bearer" and retry_count < len(self.bearer_tokens):
+                logger.warning(f"Token {self.token_index} 触发速率限制，正在尝试轮换...")
+                self._rotate_token()
+                return await self._get_request(url, params, retry_count + 1)
 
-                response.raise_for_status()
-                return await response.json()
+            logger.warning(f"所有认证方式均已达到限制，等待 {wait_time} 秒至限额重置...")
+            # 同步服务器的真实限额状态到队列令牌桶
+            queue_manager.drain_tokens("twitter_api", wait_time)
+            await asyncio.sleep(wait_time)
+            return await self._get_request(url, params, 0)
         except Exception as e:
+            if attempt < MAX_TRANSIENT_RETRIES and _is_transient(e):
+                delay = min(30, 2 ** attempt) + random.random()
+                logger.warning(f"API 请求暂时失败: {e!r}，{delay:.1f} 秒后重试 ({attempt + 1}/{MAX_TRANSIENT_RETRIES})")
+                await asyncio.sleep(delay)
+                return await self._get_request(url, params, retry_count, attempt + 1)
             token_info = f" (Token Index {self.token_index})" if self.auth_type == "bearer" else " (OAuth 1.0a)"
             logger.error(f"API 请求失败{token_info}: {e}")
             return None
@@ -188,24 +230,49 @@ class XCrawler:
             return data["data"]
         return []
 
+    async def get_users_by_usernames(self, usernames: List[str]) -> List[Dict]:
+        """批量获取用户信息，每次请求最多查询 100 个用户名"""
+        names = []
+        for username in usernames:
+            name = username.lstrip('@')
+            if USERNAME_RE.match(name):
+                names.append(name)
+            elif name:
+                logger.warning(f"跳过非法用户名: {username}")
+        chunks = [names[i:i + USERS_LOOKUP_BATCH] for i in range(0, len(names), USERS_LOOKUP_BATCH)]
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def _fetch(chunk):
+            url = f"{self.base_url}/users/by"
+            params = {
+                "usernames": ",".join(chunk),
+                "user.fields": "public_metrics,description,name,profile_image_url"
+            }
+            async with sem:
+                data = await self._get_request(url, params)
+            if data is None:
+                # 整批请求失败时逐个查询，避免整批用户被静默丢弃
+                logger.warning(f"批量查询用户失败，改为逐个查询: {', '.join(chunk)}")
+                users = []
+                for name in chunk:
+                    async with sem:
+                        user = await self.get_user_by_username(name)
+                    if user:
+                        users.append(user)
+                    else:
+                        logger.warning(f"未能获取用户信息: {name}")
+                return users
+            return data.get("data", [])
+
+        results = await asyncio.gather(*(_fetch(chunk) for chunk in chunks))
+        return [user for users in results for user in users]
+
     async def get_top_users(self, usernames: List[str], top_n: int = 10) -> List[Dict]:
         """获取前 N 名关注者最多的用户信息"""
-        users_info = []
-        for username in usernames:
-            user = await self.get_user_by_username(username)
-            if user:
-                users_info.append(user)
-            await asyncio.sleep(1)
+        users_info = await self.get_users_by_usernames(usernames)
         
-        sorted_users = sorted(
-            users_info, 
-            key=lambda x: x.get("public_metrics", {}).get("followers_count", 0), 
-            reverse=True
-        )
-        return sorted_users[:top_n]
+        return heapq.nlargest(top_n, users_info, key=_followers_count)
 
     async def close(self):
-        """关闭会话"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """共享会话由 app.core.session.close_session() 在程序退出时统一关闭"""
+        pass
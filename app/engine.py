@@ -6,16 +6,31 @@ import discord
 from app.core.config import Config
 from app.core.logger import logger
 from app.crawlers.x_crawler import XCrawler
-from app.pushers.webhook_pusher import WebhookPusher
+from app.pushers.webhook_pusher import WebhookPusher, MAX_EMBEDS_PER_MESSAGE
 from app.pushers.discord_bot import bot
 from app.core.queue_manager import queue_manager
 
+# 同一频道的消息在该时间窗口内（秒）合并为一次发送
+DISCORD_COALESCE_WINDOW = 0.5
+
 class ScraperEngine:
     def __init__(self):
         self.crawler = XCrawler()
         self.webhook_pusher = WebhookPusher()
-        self.processed_ids = Config.load_processed_ids()
-        self.following_snapshots = Config.load_following_snapshots()
+        self.processed_ids = Config.processed_ids()
+        # 关注快照在内存中以 set 保存，避免每轮重复构造
+        self.following_snapshots = {
+            user_id: set(ids) for user_id, ids in Config.load_following_snapshots().items()
+        }
+        # 同时检查的用户数上限
+        self._sem = asyncio.Semaphore(int(os.getenv("SCRAPE_CONCURRENCY", 8)))
+        # Bot 推送频道，启动时解析一次
+        self._target_channel_id = int(Config.DISCORD_CHANNEL_ID or 0)
+        # 按频道缓冲待发送的 Bot 消息: {channel_id: [(content, embed), ...]}
+        self._pending_messages = {}
+        self._flush_tasks = set()
+        # 每个频道同一时间只发送一条消息，保证顺序并避免触发频道级限流
+        self._channel_locks = {}
 
     async def run_periodic_check(self, interval_seconds: int = 300):
         """定期检查所有订阅的用户"""
@@ -28,77 +43,94 @@ class ScraperEngine:
                 # 2. 处理 Discord 用户专用订阅 (Bot + Mention)
                 await self.check_dc_user_subscriptions()
                 
-                # 保存状态
-                Config.save_processed_ids(self.processed_ids)
-                Config.save_following_snapshots(self.following_snapshots)
-                
             except Exception as e:
                 logger.error(f"检查周期发生错误: {e}")
             
             logger.info(f"一轮检查结束，等待 {interval_seconds} 秒...")
             await asyncio.sleep(interval_seconds)
 
+    async def _gather_users(self, coros):
+        """并发执行每个用户的检查，单个用户失败不影响整批"""
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"检查用户时发生错误: {result}")
+
     async def check_global_subscriptions(self):
         """检查 config/users.json 中的全局订阅"""
-        users = Config.get_global_users()
+        users = await Config.aget_global_users()
         if not users:
             return
 
-        for user_entry in users:
+        # 收集本轮所有新推文的 Embed，检查结束后合并推送
+        embeds = []
+        await self._gather_users(self._check_global_user(user_entry, embeds) for user_entry in users)
+        if embeds:
+            await self.webhook_pusher.push_embeds(embeds)
+
+    async def _check_global_user(self, user_entry: dict, embeds: list):
+        """检查单个全局订阅用户"""
+        async with self._sem:
             username = user_entry.get("username")
             user_info = await self.crawler.get_user_by_username(username)
             if not user_info:
-                continue
+                return
             
             # 这里的全局订阅目前只做推文监控
-            await self._check_tweets(user_info, is_global=True)
+            await self._check_tweets(user_info, embeds=embeds)
             # 全局订阅也可以选择性监控关注列表，目前保持简洁只监控个人
-            
-            await asyncio.sleep(2)
 
     async def check_dc_user_subscriptions(self):
         """检查 data/users_dc_*.json 中的个人订阅"""
-        dc_configs = Config.get_dc_user_configs()
-        if not dc_configs:
+        index = await Config.aget_dc_user_index()
+        if not index:
             return
 
-        for config in dc_configs:
-            discord_user_id = config["id"]
-            users = config["users"]
+        # 按 X 用户名分组订阅者，每个 X 用户每轮只请求一次
+        subscribers = {}
+        for discord_user_id, subscriptions in index.items():
+            for key, user_entry in subscriptions.items():
+                subscribers.setdefault(key, (user_entry["username"], []))[1].append(discord_user_id)
+
+        await self._gather_users(
+            self._check_dc_user(username, discord_user_ids)
+            for username, discord_user_ids in subscribers.values()
+        )
+
+    async def _check_dc_user(self, username: str, discord_user_ids: list):
+        """检查一个 X 用户，并推送给所有订阅了该用户的 Discord 用户"""
+        async with self._sem:
+            user_info = await self.crawler.get_user_by_username(username)
+            if not user_info:
+                return
             
-            for user_entry in users:
-                username = user_entry.get("username")
-                user_info = await self.crawler.get_user_by_username(username)
-                if not user_info:
-                    continue
-                
-                # 1. 监控推文
-                await self._check_tweets(user_info, discord_user_id=discord_user_id)
-                
-                # 2. 监控关注列表
-                await self._check_following(user_info, discord_user_id=discord_user_id)
-                
-                await asyncio.sleep(2)
+            # 1. 监控推文
+            await self._check_tweets(user_info, discord_user_ids=discord_user_ids)
+            
+            # 2. 监控关注列表
+            await self._check_following(user_info, discord_user_ids=discord_user_ids)
 
-    async def _check_tweets(self, user_info: dict, discord_user_id: str = None, is_global: bool = False):
-        """辅助函数：检查并推送推文"""
+    async def _check_tweets(self, user_info: dict, discord_user_ids: list = (), embeds: list = None):
+        """辅助函数：检查并推送推文（传入 embeds 时收集 Webhook Embed 稍后批量推送）"""
         username = user_info["username"]
         tweets = await self.crawler.get_latest_tweets(user_info["id"])
         
         for tweet in tweets:
-            if tweet["id"] not in self.processed_ids:
+            tweet_id = int(tweet["id"])
+            if tweet_id not in self.processed_ids:
+                # 立即标记，避免并发检查中重复推送
+                self.processed_ids.add(tweet_id)
                 logger.info(f"发现新推文: {username} - {tweet['id']}")
                 
-                if is_global:
-                    embed = WebhookPusher.format_tweet_embed(tweet, user_info)
-                    await self.webhook_pusher.push(embeds=[embed])
+                if embeds is not None:
+                    embeds.append(WebhookPusher.format_tweet_embed(tweet, user_info))
                 
-                if discord_user_id:
+                for discord_user_id in discord_user_ids:
                     await self.push_to_discord_user(discord_user_id, tweet, user_info, type="tweet")
                 
-                self.processed_ids.add(tweet["id"])
+                await Config.aappend_processed_id(tweet_id)
 
-    async def _check_following(self, user_info: dict, discord_user_id: str):
+    async def _check_following(self, user_info: dict, discord_user_ids: list):
         """辅助函数：检查并推送新关注"""
         user_id = user_info["id"]
         username = user_info["username"]
@@ -107,34 +139,65 @@ class ScraperEngine:
         if not current_following:
             return
 
-        current_following_ids = {u["id"] for u in current_following}
+        # 按 ID 建立索引，新关注的用户信息可 O(1) 查找
+        current_by_id = {u["id"]: u for u in current_following}
+        current_following_ids = set(current_by_id)
         
-        # 获取上次的快照
-        last_snapshot = self.following_snapshots.get(user_id, [])
-        if last_snapshot:
-            last_following_ids = set(last_snapshot)
+        # 获取上次的快照，关注列表未变化时无需推送也无需写盘
+        last_following_ids = self.following_snapshots.get(user_id)
+        if last_following_ids == current_following_ids:
+            return
+
+        if last_following_ids:
             # 找出新关注的人
             new_following_ids = current_following_ids - last_following_ids
             
             for new_id in new_following_ids:
-                new_user_info = next((u for u in current_following if u["id"] == new_id), None)
-                if new_user_info:
-                    logger.info(f"发现新关注: @{username} 关注了 @{new_user_info['username']}")
+                new_user_info = current_by_id[new_id]
+                logger.info(f"发现新关注: @{username} 关注了 @{new_user_info['username']}")
+                for discord_user_id in discord_user_ids:
                     await self.push_to_discord_user(discord_user_id, new_user_info, user_info, type="following")
         
-        # 更新快照
-        self.following_snapshots[user_id] = list(current_following_ids)
+        # 更新快照，只写入该用户的分片
+        self.following_snapshots[user_id] = current_following_ids
+        await Config.asave_following_snapshot(user_id, current_following_ids)
 
-    async def _send_discord_message(self, channel_id: int, content: str, embed: discord.Embed):
-        """异步发送Discord消息"""
+    async def _send_discord_message(self, channel_id: int, content: str, embeds: list):
+        """异步发送Discord消息（一次最多 10 个 Embed）"""
         channel = bot.get_channel(channel_id)
         if not channel:
             return
-        await channel.send(content=content, embed=embed)
+        lock = self._channel_locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            await channel.send(content=content, embeds=embeds)
+
+    def _enqueue_discord_message(self, channel_id: int, content: str, embed: discord.Embed):
+        """缓冲一条频道消息，窗口结束后与同频道的其他消息合并发送"""
+        pending = self._pending_messages.get(channel_id)
+        if pending is None:
+            pending = self._pending_messages[channel_id] = []
+            task = asyncio.create_task(self._flush_channel(channel_id))
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        pending.append((content, embed))
+
+    async def _flush_channel(self, channel_id: int):
+        """将缓冲的消息按每条最多 10 个 Embed 合并后加入发送队列"""
+        await asyncio.sleep(DISCORD_COALESCE_WINDOW)
+        pending = self._pending_messages.pop(channel_id, [])
+        for i in range(0, len(pending), MAX_EMBEDS_PER_MESSAGE):
+            batch = pending[i:i + MAX_EMBEDS_PER_MESSAGE]
+            # 相同的提醒文本（如同一用户的多条推文）只保留一次
+            content = "\n".join(dict.fromkeys(c for c, _ in batch))
+            await queue_manager.add_task(
+                "discord_bot",
+                self._send_discord_message,
+                channel_id, content, [e for _, e in batch]
+            )
 
     async def push_to_discord_user(self, discord_user_id: str, data: dict, target_user_info: dict, type: str = "tweet"):
         """通过 Bot 推送给特定用户并 @他，通过队列管理器"""
-        target_channel_id = int(os.getenv("DISCORD_CHANNEL_ID", 0))
+        target_channel_id = self._target_channel_id
         if not target_channel_id:
             return
 
@@ -160,9 +223,5 @@ class ScraperEngine:
             
         embed.set_footer(text=f"时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # 将发送任务添加到队列
-        await queue_manager.add_task(
-            "discord_bot",
-            self._send_discord_message,
-            target_channel_id, content, embed
-        )
+        # 缓冲后合并加入发送队列
+        self._enqueue_discord_message(target_channel_id, content, embed)
@@ -37,14 +37,13 @@ bot = DiscordBot()
 async def admin_followers_list(interaction: discord.Interaction):
     user_id = str(interaction.user.id)
     # 尝试加载当前用户的专有订阅
-    user_configs = Config.get_dc_user_configs()
-    current_user_config = next((c for c in user_configs if c["id"] == user_id), None)
+    subscriptions = (await Config.aget_dc_user_index()).get(user_id)
     
-    if not current_user_config or not current_user_config["users"]:
+    if not subscriptions:
         await interaction.response.send_message("你目前没有任何订阅用户。", ephemeral=True)
         return
     
-    users_list = "\n".join([f"- @{u['username']}" for u in current_user_config["users"]])
+    users_list = "\n".join([f"- @{u['username']}" for u in subscriptions.values()])
     await interaction.response.send_message(f"你的订阅列表：\n{users_list}", ephemeral=True)
 
 @bot.tree.command(name="followers_add", description="增加订阅用户")
@@ -55,25 +54,22 @@ async def followers_add(interaction: discord.Interaction, username: str):
     
     await interaction.response.defer(ephemeral=True)
 
+    # 加载当前订阅，防止重复（在请求 API 之前检查）
+    subscriptions = (await Config.aget_dc_user_index()).get(user_id, {})
+    if username.lower() in subscriptions:
+        await interaction.followup.send(f"你已经订阅了 @{username}。", ephemeral=True)
+        return
+
     # 验证并获取增强元数据
-    metadata = bot.user_service.get_user_metadata(username)
+    metadata = await bot.user_service.get_user_metadata(username)
     if not metadata.get("id"):
         await interaction.followup.send(f"未找到用户 @{username}，请检查拼写。", ephemeral=True)
         return
     
-    # 加载并更新配置
-    user_configs = Config.get_dc_user_configs()
-    current_user_config = next((c for c in user_configs if c["id"] == user_id), {"id": user_id, "users": []})
-    
-    # 防止重复
-    if any(u['username'].lower() == username.lower() for u in current_user_config["users"]):
-        await interaction.followup.send(f"你已经订阅了 @{username}。", ephemeral=True)
-        return
-    
     # 使用增强元数据
-    current_user_config["users"].append(metadata)
+    users = [*subscriptions.values(), metadata]
     
-    if Config.save_dc_user_config(user_id, current_user_config["users"]):
+    if await Config.asave_dc_user_config(user_id, users):
         tags_str = ", ".join(metadata['tags']) if metadata['tags'] else "无"
         await interaction.followup.send(
             f"✅ 成功订阅 **{metadata.get('name', username)}** (@{username})！\n"
@@ -90,21 +86,19 @@ async def followers_delete(interaction: discord.Interaction, username: str):
     user_id = str(interaction.user.id)
     username = username.lstrip('@')
     
-    user_configs = Config.get_dc_user_configs()
-    current_user_config = next((c for c in user_configs if c["id"] == user_id), None)
+    subscriptions = (await Config.aget_dc_user_index()).get(user_id)
     
-    if not current_user_config or not current_user_config["users"]:
+    if not subscriptions:
         await interaction.response.send_message("你目前没有任何订阅用户。", ephemeral=True)
         return
     
-    initial_count = len(current_user_config["users"])
-    current_user_config["users"] = [u for u in current_user_config["users"] if u['username'].lower() != username.lower()]
-    
-    if len(current_user_config["users"]) == initial_count:
+    key = username.lower()
+    if key not in subscriptions:
         await interaction.response.send_message(f"你的订阅列表中没有 @{username}。", ephemeral=True)
         return
     
-    if Config.save_dc_user_config(user_id, current_user_config["users"]):
+    users = [u for name, u in subscriptions.items() if name != key]
+    if await Config.asave_dc_user_config(user_id, users):
         await interaction.response.send_message(f"❌ 已成功取消订阅 @{username}。", ephemeral=True)
     else:
         await interaction.response.send_message("操作失败，请重试。", ephemeral=True)
@@ -112,19 +106,19 @@ async def followers_delete(interaction: discord.Interaction, username: str):
 @bot.tree.command(name="admin_all_stats", description="[管理员] 查看所有用户的订阅统计")
 @is_admin()
 async def admin_all_stats(interaction: discord.Interaction):
-    user_configs = Config.get_dc_user_configs()
-    if not user_configs:
+    index = await Config.aget_dc_user_index()
+    if not index:
         await interaction.response.send_message("目前没有任何用户有订阅。", ephemeral=True)
         return
 
     message = "📋 **全站订阅统计 (仅限管理员)**\n"
     total_subs = 0
-    for config in user_configs:
-        sub_count = len(config["users"])
+    for discord_id, subscriptions in index.items():
+        sub_count = len(subscriptions)
         total_subs += sub_count
-        message += f"- 用户 <@{config['id']}>: {sub_count} 个订阅\n"
+        message += f"- 用户 <@{discord_id}>: {sub_count} 个订阅\n"
     
-    message += f"\n**总计**: {len(user_configs)} 名用户, {total_subs} 个 X 订阅项目"
+    message += f"\n**总计**: {len(index)} 名用户, {total_subs} 个 X 订阅项目"
     await interaction.response.send_message(message, ephemeral=True)
 
 @bot.tree.command(name="admin_view_user", description="[管理员] 查看指定用户的订阅列表")
@@ -132,14 +126,13 @@ async def admin_all_stats(interaction: discord.Interaction):
 @is_admin()
 async def admin_view_user(interaction: discord.Interaction, user: discord.User):
     user_id = str(user.id)
-    user_configs = Config.get_dc_user_configs()
-    current_user_config = next((c for c in user_configs if c["id"] == user_id), None)
+    subscriptions = (await Config.aget_dc_user_index()).get(user_id)
     
-    if not current_user_config or not current_user_config["users"]:
+    if not subscriptions:
         await interaction.response.send_message(f"用户 {user.display_name} 没有任何订阅。", ephemeral=True)
         return
     
-    users_list = "\n".join([f"- @{u['username']} ({u['name']})" for u in current_user_config["users"]])
+    users_list = "\n".join([f"- @{u['username']} ({u['name']})" for u in subscriptions.values()])
     await interaction.response.send_message(f"用户 <@{user_id}> 的订阅列表：\n{users_list}", ephemeral=True)
 
 @bot.tree.command(name="admin_delete_for_user", description="[管理员] 强制删除指定用户的某个订阅")
@@ -149,21 +142,19 @@ async def admin_delete_for_user(interaction: discord.Interaction, user: discord.
     user_id = str(user.id)
     username = twitter_username.lstrip('@')
     
-    user_configs = Config.get_dc_user_configs()
-    current_user_config = next((c for c in user_configs if c["id"] == user_id), None)
+    subscriptions = (await Config.aget_dc_user_index()).get(user_id)
     
-    if not current_user_config or not current_user_config["users"]:
+    if not subscriptions:
         await interaction.response.send_message(f"用户 {user.display_name} 没有任何订阅。", ephemeral=True)
         return
     
-    initial_count = len(current_user_config["users"])
-    current_user_config["users"] = [u for u in current_user_config["users"] if u['username'].lower() != username.lower()]
-    
-    if len(current_user_config["users"]) == initial_count:
+    key = username.lower()
+    if key not in subscriptions:
         await interaction.response.send_message(f"用户 {user.display_name} 的列表中没有 @{username}。", ephemeral=True)
         return
     
-    if Config.save_dc_user_config(user_id, current_user_config["users"]):
+    users = [u for name, u in subscriptions.items() if name != key]
+    if await Config.asave_dc_user_config(user_id, users):
         await interaction.response.send_message(f"✅ 管理员操作：已为 <@{user_id}> 取消订阅 @{username}。", ephemeral=True)
     else:
         await interaction.response.send_message("操作失败。", ephemeral=True)
@@ -171,7 +162,7 @@ async def admin_delete_for_user(interaction: discord.Interaction, user: discord.
 @bot.tree.command(name="admin_global_list", description="[管理员] 查看全局扫描名单 (users.json)")
 @is_admin()
 async def admin_global_list(interaction: discord.Interaction):
-    global_users = Config.get_global_users()
+    global_users = await Config.aget_global_users()
     if not global_users:
         await interaction.response.send_message("全局扫描名单为空。", ephemeral=True)
         return
@@ -191,15 +182,14 @@ async def followtop10(interaction: discord.Interaction):
     await interaction.response.defer()
     
     user_id = str(interaction.user.id)
-    user_configs = Config.get_dc_user_configs()
-    current_user_config = next((c for c in user_configs if c["id"] == user_id), None)
+    subscriptions = (await Config.aget_dc_user_index()).get(user_id)
     
-    if not current_user_config or not current_user_config["users"]:
+    if not subscriptions:
         await interaction.followup.send("你目前没有任何订阅用户。", ephemeral=True)
         return
     
-    usernames = [u["username"] for u in current_user_config["users"]]
-    top_users = bot.crawler.get_top_users(usernames)
+    usernames = [u["username"] for u in subscriptions.values()]
+    top_users = await bot.crawler.get_top_users(usernames)
     
     if not top_users:
         await interaction.followup.send("获取数据失败。", ephemeral=True)
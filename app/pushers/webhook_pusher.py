@@ -1,14 +1,20 @@
 import asyncio
-import json
 import aiohttp
+from typing import Optional
 from app.core.logger import logger
 from app.core.config import Config
 from app.core.queue_manager import queue_manager
+from app.core.session import get_session, close_session
+from app.core import serialization
+
+# Discord 单条 Webhook 消息最多支持的 Embed 数量
+MAX_EMBEDS_PER_MESSAGE = 10
 
 class WebhookPusher:
-    def __init__(self, webhook_url: str = None):
+    def __init__(self, webhook_url: str = None, session: Optional[aiohttp.ClientSession] = None):
         self.webhook_url = webhook_url or Config.DISCORD_WEBHOOK_URL
-        self.session = None
+        # 未指定时使用进程内共享会话
+        self.session = session
 
     async def _push_async(self, content: str = None, embeds: list = None):
         """异步推送消息到 Discord Webhook"""
@@ -23,14 +29,12 @@ class WebhookPusher:
             payload["embeds"] = embeds
 
         try:
-            if self.session is None:
-                self.session = aiohttp.ClientSession()
+            session = self.session or get_session()
             
-            async with self.session.post(
+            async with session.post(
                 self.webhook_url, 
-                data=json.dumps(payload), 
-                headers={"Content-Type": "application/json"}, 
-                timeout=10
+                data=serialization.dumps(payload), 
+                headers={"Content-Type": "application/json"}
             ) as response:
                 response.raise_for_status()
                 return True
@@ -48,21 +52,38 @@ class WebhookPusher:
         )
         return True
 
+    async def push_embeds(self, embeds: list):
+        """批量推送 Embed，每条消息最多携带 10 个，减少 Webhook 请求次数"""
+        for i in range(0, len(embeds), MAX_EMBEDS_PER_MESSAGE):
+            await self.push(embeds=embeds[i:i + MAX_EMBEDS_PER_MESSAGE])
+
     def push_sync(self, content: str = None, embeds: list = None):
-        """同步推送接口，内部转为异步"""
-        return asyncio.run(self.push(content, embeds))
+        """同步推送接口，仅供没有事件循环的脚本使用；在协程中请直接 await push()"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 临时事件循环中没有队列 worker，直接发送
+            return asyncio.run(self._push_once(content, embeds))
+        raise RuntimeError("push_sync() 不能在事件循环中调用，请使用 await push()")
+
+    async def _push_once(self, content: str = None, embeds: list = None):
+        """单次发送，结束后关闭绑定在临时事件循环上的共享会话"""
+        try:
+            return await self._push_async(content, embeds)
+        finally:
+            if self.session is None:
+                await close_session()
 
     async def close(self):
-        """关闭会话"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """共享会话由 app.core.session.close_session() 在程序退出时统一关闭"""
+        pass
 
     @staticmethod
     def format_tweet_embed(tweet: dict, user_info: dict):
         """格式化推文为 Discord Embed"""
         username = user_info.get("username", "Unknown")
         name = user_info.get("name", "Unknown")
+        metrics = tweet.get("public_metrics") or {}
         
         embed = {
             "title": f"来自 {name} (@{username}) 的新推文",
@@ -72,7 +93,7 @@ class WebhookPusher:
             "fields": [
                 {
                     "name": "互动",
-                    "value": f"💬 {tweet.get('public_metrics', {}).get('reply_count', 0)} | 🔁 {tweet.get('public_metrics', {}).get('retweet_count', 0)} | ❤️ {tweet.get('public_metrics', {}).get('like_count', 0)}",
+                    "value": f"💬 {metrics.get('reply_count', 0)} | 🔁 {metrics.get('retweet_count', 0)} | ❤️ {metrics.get('like_count', 0)}",
                     "inline": True
                 }
             ],
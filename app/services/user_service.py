@@ -3,17 +3,35 @@ from typing import List, Dict, Optional
 from app.crawlers.x_crawler import XCrawler
 from app.core.logger import logger
 
+# 简介中的 # 话题标签
+_HASHTAG_RE = re.compile(r'#(\w+)')
+# 常见领域关键词 (可选扩展)，合并为一个正则单次扫描
+_COMMON_AREAS = ("crypto", "ai", "web3", "tech", "nft", "btc", "eth", "solana", "trading")
+_KEYWORDS_RE = re.compile(r'\b(' + '|'.join(_COMMON_AREAS) + r')\b', re.IGNORECASE)
+
 class UserService:
     def __init__(self, crawler: Optional[XCrawler] = None):
         self.crawler = crawler or XCrawler()
 
-    def get_user_metadata(self, username: str) -> Dict:
+    async def get_user_metadata(self, username: str) -> Dict:
         """
         获取用户元数据并自动生成配置信息
         """
         username = username.lstrip('@')
-        user_info = self.crawler.get_user_by_username(username)
-        
+        user_info = await self.crawler.get_user_by_username(username)
+        return self._build_metadata(username, user_info)
+
+    async def get_users_metadata(self, usernames: List[str]) -> List[Dict]:
+        """
+        批量获取多个用户的元数据（按 100 个一组并发查询），顺序与输入一致
+        """
+        usernames = [u.lstrip('@') for u in usernames]
+        users_info = await self.crawler.get_users_by_usernames(usernames)
+        info_by_name = {u["username"].lower(): u for u in users_info if u.get("username")}
+        return [self._build_metadata(name, info_by_name.get(name.lower())) for name in usernames]
+
+    def _build_metadata(self, username: str, user_info: Optional[Dict]) -> Dict:
+        """根据 API 返回的用户信息生成订阅配置"""
         if not user_info:
             logger.warning(f"无法获取用户 @{username} 的信息，将使用默认配置")
             return {
@@ -53,13 +71,9 @@ class UserService:
             return []
         
         # 提取 # 标签
-        hashtags = re.findall(r'#(\w+)', description)
+        hashtags = set(_HASHTAG_RE.findall(description))
         
-        # 常见关键词提取 (可选扩展)
-        keywords = []
-        common_areas = ["crypto", "ai", "web3", "tech", "nft", "btc", "eth", "solana", "trading"]
-        for area in common_areas:
-            if area.lower() in description.lower() and area not in hashtags:
-                keywords.append(area)
+        # 常见关键词提取
+        keywords = {m.lower() for m in _KEYWORDS_RE.findall(description)} - hashtags
         
-        return list(set(hashtags + keywords))
+        return list(hashtags | keywords)
@@ -1,10 +1,18 @@
 import asyncio
 import threading
+
+try:
+    # 可选依赖：uvloop 提供更快的事件循环（Windows 不支持）
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from app.core.config import Config
 from app.core.logger import logger
 from app.engine import ScraperEngine
 from app.pushers.discord_bot import bot, start_bot
 from app.core.queue_manager import queue_manager
+from app.core.session import close_session
 
 async def run_engine():
     """在后台运行采集引擎"""
@@ -37,9 +45,14 @@ async def main():
         await bot.close()
         # 停止队列管理器
         await queue_manager.stop()
+        # 关闭共享 HTTP 会话
+        await close_session()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("服务已停止")
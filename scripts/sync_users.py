@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 import os
-import json
+import asyncio
 import argparse
 import sys
 from pathlib import Path
@@ -11,8 +11,17 @@ sys.path.append(str(base_dir))
 
 from app.services.user_service import UserService
 from app.core.config import Config
+from app.core import serialization
+from app.core.session import close_session
 from app.core.logger import logger
 
+async def fetch_users_metadata(usernames):
+    """批量获取新用户的元数据"""
+    try:
+        return await UserService().get_users_metadata(usernames)
+    finally:
+        await close_session()
+
 def sync_users(fetch_metadata=False):
     users_txt_path = Config.CONFIG_DIR / "users.txt"
     users_json_path = Config.CONFIG_DIR / "users.json"
@@ -21,21 +30,16 @@ def sync_users(fetch_metadata=False):
         logger.error(f"找不到 {users_txt_path}")
         return
 
-    # 1. 读取 users.txt
-    with open(users_txt_path, 'r', encoding='utf-8') as f:
-        txt_usernames = set()
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                # 兼容 @ 符号
-                txt_usernames.add(line.lstrip('@').lower())
+    # 1. 读取 users.txt（一次读入，忽略空行与 # 注释，兼容 @ 符号）
+    lines = (line.strip() for line in users_txt_path.read_text(encoding='utf-8').splitlines())
+    txt_usernames = {line.lstrip('@').lower() for line in lines if line and line[0] != '#'}
+    txt_usernames.discard('')
 
     # 2. 读取现有的 users.json
     existing_users = []
     if users_json_path.exists():
         try:
-            with open(users_json_path, 'r', encoding='utf-8') as f:
-                existing_users = json.load(f)
+            existing_users = serialization.loads(users_json_path.read_bytes())
         except Exception as e:
             logger.error(f"读取 users.json 失败: {e}")
 
@@ -43,30 +47,29 @@ def sync_users(fetch_metadata=False):
     existing_users_dict = {u['username'].lower(): u for u in existing_users}
 
     # 3. 同步
-    new_users_list = []
-    user_service = UserService()
+    new_usernames = sorted(txt_usernames - existing_users_dict.keys())
+    for username in new_usernames:
+        logger.info(f"发现新用户: @{username}")
 
+    # 新用户：如果开启了 fetch 则批量获取元数据，否则使用极简默认值
+    if fetch_metadata and new_usernames:
+        new_metadata = asyncio.run(fetch_users_metadata(new_usernames))
+    else:
+        new_metadata = [{
+            "username": username,
+            "count": 500,
+            "priority": "low",
+            "tags": []
+        } for username in new_usernames]
+    new_users_dict = dict(zip(new_usernames, new_metadata))
+
+    new_users_list = []
     for username in sorted(txt_usernames):
-        if username in existing_users_dict:
-            # 保留现有配置
-            new_users_list.append(existing_users_dict[username])
-        else:
-            # 新用户：如果开启了 fetch 则获取元数据，否则使用极简默认值
-            logger.info(f"发现新用户: @{username}")
-            if fetch_metadata:
-                metadata = user_service.get_user_metadata(username)
-                new_users_list.append(metadata)
-            else:
-                new_users_list.append({
-                    "username": username,
-                    "count": 500,
-                    "priority": "low",
-                    "tags": []
-                })
+        # 保留现有配置
+        new_users_list.append(existing_users_dict.get(username) or new_users_dict[username])
 
     # 4. 保存
-    with open(users_json_path, 'w', encoding='utf-8') as f:
-        json.dump(new_users_list, f, indent=2, ensure_ascii=False)
+    users_json_path.write_bytes(serialization.dumps(new_users_list, indent=True))
     
     logger.info(f"同步完成！当前共有 {len(new_users_list)} 个活跃订阅用户。")
 
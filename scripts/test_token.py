@@ -1,11 +1,13 @@
-import requests
 import os
+import asyncio
+import aiohttp
 import sys
 from dotenv import load_dotenv
 
-def test_twitter_token(token: str):
+async def test_twitter_token(session: aiohttp.ClientSession, token: str):
     """验证 Twitter Bearer Token 是否可用，支持代理"""
-    print(f"开始验证 Token: {token[:20]}...{token[-10:]}")
+    # 多个 Token 并发验证，输出先缓存，结束后一次性打印避免交错
+    lines = [f"开始验证 Token: {token[:20]}...{token[-10:]}"]
     
     url = "https://api.twitter.com/2/users/by/username/Twitter"
     headers = {
@@ -13,42 +15,42 @@ def test_twitter_token(token: str):
         "User-Agent": "TokenValidator"
     }
     
-    # 尝试从环境变量获取代理配置
-    proxies = {}
-    http_proxy = os.getenv("HTTP_PROXY") or os.getenv("http_proxy")
-    https_proxy = os.getenv("HTTPS_PROXY") or os.getenv("https_proxy")
-    
-    if http_proxy:
-        proxies["http"] = http_proxy
-    if https_proxy:
-        proxies["https"] = https_proxy
-        
-    if proxies:
-        print(f"检测到代理配置: {proxies}")
-    
     try:
-        response = requests.get(url, headers=headers, proxies=proxies, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            print("✅ 验证成功！")
-            print(f"数据反馈: {data.get('data', {}).get('name')} (@{data.get('data', {}).get('username')})")
-            return True
-        elif response.status_code == 401:
-            print("❌ 验证失败: 401 Unauthorized (Token 无效或已过期)")
-        elif response.status_code == 403:
-            print("❌ 验证失败: 403 Forbidden (权限不足，请确认已在 Developer Portal 开启权限)")
-        elif response.status_code == 429:
-            print("⚠️ 验证失败: 429 Too Many Requests (该 Token 已被限流)")
-        else:
-            print(f"❓ 验证失败: HTTP {response.status_code}")
-            print(response.text)
-            
-        return False
+        async with session.get(url, headers=headers) as response:
+            if response.status == 200:
+                data = await response.json()
+                lines.append("✅ 验证成功！")
+                lines.append(f"数据反馈: {data.get('data', {}).get('name')} (@{data.get('data', {}).get('username')})")
+                return True
+            elif response.status == 401:
+                lines.append("❌ 验证失败: 401 Unauthorized (Token 无效或已过期)")
+            elif response.status == 403:
+                lines.append("❌ 验证失败: 403 Forbidden (权限不足，请确认已在 Developer Portal 开启权限)")
+            elif response.status == 429:
+                lines.append("⚠️ 验证失败: 429 Too Many Requests (该 Token 已被限流)")
+            else:
+                lines.append(f"❓ 验证失败: HTTP {response.status}")
+                lines.append(await response.text())
+                
+            return False
     except Exception as e:
-        print(f"💥 请求过程中发生错误: {e}")
-        print("\n[提示] 如果你在国内，请确保在 .env 中正确配置了代理（HTTP_PROXY/HTTPS_PROXY）或者开启了系统全局代理。")
+        lines.append(f"💥 请求过程中发生错误: {e}")
+        lines.append("\n[提示] 如果你在国内，请确保在 .env 中正确配置了代理（HTTP_PROXY/HTTPS_PROXY）或者开启了系统全局代理。")
         return False
+    finally:
+        lines.append("-" * 40)
+        print("\n".join(lines))
+
+async def test_twitter_tokens(tokens):
+    """并发验证多个 Token，总耗时约等于单个请求耗时"""
+    # trust_env=True 时自动读取 HTTP_PROXY/HTTPS_PROXY 环境变量
+    proxy = os.getenv("HTTPS_PROXY") or os.getenv("https_proxy") or os.getenv("HTTP_PROXY") or os.getenv("http_proxy")
+    if proxy:
+        print(f"检测到代理配置: {proxy}")
+    
+    timeout = aiohttp.ClientTimeout(total=15)
+    async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        return await asyncio.gather(*(test_twitter_token(session, t) for t in tokens))
 
 if __name__ == "__main__":
     # 加载 .env
@@ -65,8 +67,6 @@ if __name__ == "__main__":
         print("错误: 未找到可测试的 Token，请在 .env 中填写。")
         sys.exit(1)
         
-    tokens_to_test = target_token.split(',')
+    tokens_to_test = [t.strip() for t in target_token.split(',') if t.strip()]
     
-    for t in tokens_to_test:
-        test_twitter_token(t.strip())
-        print("-" * 40)
+    asyncio.run(test_twitter_tokens(tokens_to_test))
@@ -7,6 +7,7 @@ from app.core.config import Config
 from app.core.logger import logger
 from app.engine import ScraperEngine
 from app.core.queue_manager import queue_manager
+from app.core.session import close_session
 
 async def main():
     logger.info("开始定时 Webhook 全局推送...")
@@ -18,9 +19,6 @@ async def main():
         # 只运行一次全局检查
         await engine.check_global_subscriptions()
         
-        # 保存 ID
-        Config.save_processed_ids(engine.processed_ids)
-        
         # 等待队列处理完成
         await queue_manager.wait_for_empty_queues()
         
@@ -31,11 +29,8 @@ async def main():
         # 停止队列管理器
         await queue_manager.stop()
         
-        # 关闭crawler会话
-        await engine.crawler.close()
-        
-        # 关闭webhook_pusher会话
-        await engine.webhook_pusher.close()
+        # 关闭共享 HTTP 会话
+        await close_session()
 
 if __name__ == "__main__":
     asyncio.run(main())
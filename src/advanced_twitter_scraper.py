@@ -21,13 +21,21 @@ Usage:
 """
 
 import os
+import sys
 import json
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import time
 import random
+import re
 import argparse
 import hashlib
+import math
+import mmap
+import struct
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Callable
 from urllib.parse import urljoin
 import threading
 from concurrent.futures import ThreadPoolExecutor
@@ -40,6 +48,16 @@ except ImportError:
     print("Error: requests not installed. Install with: pip install requests")
     exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 try:
     from selenium import webdriver
     from selenium.webdriver.common.by import By
@@ -49,19 +67,288 @@ try:
     from selenium.webdriver.chrome.service import Service
     from webdriver_manager.chrome import ChromeDriverManager
     from selenium.common.exceptions import TimeoutException, NoSuchElementException
+    
+    # Locator for rendered tweets
+    TWEET_SELECTOR = (By.CSS_SELECTOR, '[data-testid="tweet"]')
 except ImportError:
     print("Warning: Selenium not installed. Selenium method will not be available.")
     print("Install with: pip install selenium webdriver-manager")
 
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    print("Error: BeautifulSoup not installed. Install with: pip install beautifulsoup4 lxml")
-    exit(1)
+# Progress logger for the scroll loop; see start_log_listener()
+logger = logging.getLogger("advanced_twitter_scraper")
+
+# The one running listener, its queue handler and how many callers are using it
+_LOG_LISTENER: Optional[QueueListener] = None
+_LOG_HANDLER: Optional[QueueHandler] = None
+_LOG_USERS = 0
+_LOG_LOCK = threading.Lock()
+
+def start_log_listener() -> QueueListener:
+    """
+    Send progress logging through a queue drained by a background thread,
+    so scroll loops in worker threads never block on stdout.
+    Nested calls share one listener; pair each call with stop_log_listener().
+    """
+    global _LOG_LISTENER, _LOG_HANDLER, _LOG_USERS
+    with _LOG_LOCK:
+        if _LOG_LISTENER is None:
+            log_queue = queue.SimpleQueue()
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            _LOG_LISTENER = QueueListener(log_queue, handler)
+            _LOG_HANDLER = QueueHandler(log_queue)
+            logger.addHandler(_LOG_HANDLER)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            _LOG_LISTENER.start()
+        _LOG_USERS += 1
+        return _LOG_LISTENER
+
+def stop_log_listener():
+    """
+    Release one start_log_listener() call; the last one flushes and stops the listener.
+    """
+    global _LOG_LISTENER, _LOG_HANDLER, _LOG_USERS
+    with _LOG_LOCK:
+        if _LOG_LISTENER is None:
+            return
+        _LOG_USERS -= 1
+        if _LOG_USERS > 0:
+            return
+        _LOG_LISTENER.stop()
+        logger.removeHandler(_LOG_HANDLER)
+        logger.propagate = True
+        _LOG_LISTENER = _LOG_HANDLER = None
+        _LOG_USERS = 0
+
+def dump_json(obj, indent: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, using orjson when available.
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def load_json(data):
+    """
+    Parse JSON from bytes or str, using orjson when available.
+    """
+    return orjson.loads(data) if orjson else json.loads(data)
+
+# First number in a metric label, e.g. "1,234 Likes" or "12.3K"
+_NUMBER_RE = re.compile(r'(\d[\d,.]*)([KMB]?)', re.IGNORECASE)
+_SUFFIX_MULTIPLIERS = {'': 1, 'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+# Upper bound for the adaptive delay between actions (seconds)
+MAX_DELAY = 60
+
+# Extracts every rendered tweet not seen before in one round-trip. Each node is
+# tagged with the status link it held when read; the timeline reuses article
+# nodes, so a node whose link no longer matches its tag holds a new tweet
+JS_EXTRACT_TWEETS = """
+const nodes = document.querySelectorAll('[data-testid="tweet"]');
+const label = (el, sel) => {
+    const m = el.querySelector(sel);
+    return m ? (m.getAttribute('aria-label') || '') : '';
+};
+const out = [];
+for (const el of nodes) {
+    const link = el.querySelector('a[href*="/status/"]');
+    const href = link ? link.href : '';
+    if (href && el.dataset.scraped === href) continue;
+    el.dataset.scraped = href;
+    const text = el.querySelector('[data-testid="tweetText"]');
+    const time = el.querySelector('time');
+    out.push({
+        text: text ? text.innerText.trim() : '',
+        created_at: time ? time.getAttribute('datetime') : null,
+        time_text: time ? time.innerText : '',
+        replies: label(el, '[data-testid="reply"]'),
+        retweets: label(el, '[data-testid="retweet"]'),
+        likes: label(el, '[data-testid="like"]'),
+        url: href
+    });
+}
+return out;
+"""
+
+# Engagement labels of a single tweet element as {testid: aria-label}, in one round-trip
+JS_METRICS = """
+const els = arguments[0].querySelectorAll('[data-testid="reply"],[data-testid="retweet"],[data-testid="like"]');
+const out = {};
+for (const el of els) {
+    out[el.dataset.testid] = el.getAttribute('aria-label') || '';
+}
+return out;
+"""
+
+# Maps JS_METRICS testids to metric names
+_METRIC_TESTIDS = {'reply': 'replies', 'retweet': 'retweets', 'like': 'likes'}
+
+# Subresources the scraper never needs; blocked through CDP to save bandwidth
+BLOCKED_URL_PATTERNS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.mp4', '*.m3u8', '*.m4s', '*.woff', '*.woff2', '*.ttf',
+    '*google-analytics*', '*doubleclick*', '*googletagmanager*'
+]
+
+# ChromeDriver binary path, resolved once per process
+_DRIVER_PATH: Optional[str] = None
+_DRIVER_PATH_LOCK = threading.Lock()
+
+def get_driver_path() -> str:
+    """
+    Resolve the ChromeDriver path once and reuse it for every driver.
+    """
+    global _DRIVER_PATH
+    with _DRIVER_PATH_LOCK:
+        if _DRIVER_PATH is None:
+            _DRIVER_PATH = ChromeDriverManager().install()
+    return _DRIVER_PATH
+
+# Process-wide HTTP session so every scraper instance shares one keep-alive pool
+_SHARED_SESSION: Optional['requests.Session'] = None
+
+def get_shared_session() -> 'requests.Session':
+    """
+    Return the shared requests session, creating it on first use.
+    """
+    global _SHARED_SESSION
+    if _SHARED_SESSION is None:
+        session = requests.Session()
+        
+        # Retry strategy
+        retry_strategy = Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=100, max_retries=retry_strategy)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SHARED_SESSION = session
+    return _SHARED_SESSION
+
+def close_shared_session():
+    """
+    Close the shared requests session, if one was created.
+    """
+    global _SHARED_SESSION
+    if _SHARED_SESSION is not None:
+        _SHARED_SESSION.close()
+        _SHARED_SESSION = None
+
+# Header of a persisted Bloom filter file: bit size, hash count, item count
+BLOOM_HEADER = struct.Struct('<QQQ')
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for tweet deduplication.
+    Keys are 64-bit tweet ids; Kirsch-Mitzenmacher double hashing derives all
+    k bit positions from the two 32-bit halves, so no per-tweet object is kept.
+    """
+    
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-7):
+        """
+        Args:
+            capacity (int): Expected number of distinct items
+            error_rate (float): Target false positive rate at capacity
+        """
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self._mmap = None
+        # add() is a read-modify-write over several bytes; one filter may be shared by worker threads
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def open(cls, path: str, capacity: int = 1_000_000, error_rate: float = 1e-7) -> 'BloomFilter':
+        """
+        Open a filter persisted at path, creating it if missing.
+        The bits are memory-mapped, so loading is O(1) and inserts reach disk
+        through the page cache. An existing file keeps the parameters it was created with.
+        """
+        bloom = cls(capacity, error_rate)
+        try:
+            # O_EXCL: only the creator initializes the file, nobody truncates a mapped one
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            with open(path, 'r+b') as f:
+                header = f.read(BLOOM_HEADER.size)
+                if len(header) < BLOOM_HEADER.size:
+                    raise ValueError(f"{path} is not a Bloom filter file")
+                bloom.size, bloom.hash_count, bloom.count = BLOOM_HEADER.unpack(header)
+                expected = BLOOM_HEADER.size + (bloom.size + 7) // 8
+                actual = os.fstat(f.fileno()).st_size
+                if not bloom.size or not bloom.hash_count or actual != expected:
+                    raise ValueError(
+                        f"{path} is truncated or not a Bloom filter file "
+                        f"({actual} bytes, header expects {expected}); delete it to rebuild"
+                    )
+                bloom._mmap = mmap.mmap(f.fileno(), 0)
+        else:
+            with os.fdopen(fd, 'w+b') as f:
+                f.write(BLOOM_HEADER.pack(bloom.size, bloom.hash_count, 0))
+                f.truncate(BLOOM_HEADER.size + len(bloom.bits))
+                bloom._mmap = mmap.mmap(f.fileno(), 0)
+        bloom.bits = memoryview(bloom._mmap)[BLOOM_HEADER.size:]
+        return bloom
+    
+    def flush(self):
+        """
+        Write the item count and any dirty pages of a file-backed filter to disk.
+        """
+        if self._mmap is not None:
+            with self._lock:
+                self._mmap[:BLOOM_HEADER.size] = BLOOM_HEADER.pack(self.size, self.hash_count, self.count)
+            self._mmap.flush()
+    
+    def close(self):
+        """
+        Flush and unmap a file-backed filter. No-op for in-memory filters.
+        """
+        if self._mmap is None:
+            return
+        self.flush()
+        self.bits.release()
+        self.bits = bytearray()
+        self._mmap.close()
+        self._mmap = None
+    
+    def _indexes(self, key: int):
+        h1 = key & 0xFFFFFFFF
+        h2 = (key >> 32) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+    
+    def add(self, key: int) -> bool:
+        """
+        Add key to the filter. Returns True if it was (probably) already present.
+        """
+        indexes = self._indexes(key)
+        present = True
+        with self._lock:
+            bits = self.bits
+            for index in indexes:
+                mask = 1 << (index & 7)
+                if not bits[index >> 3] & mask:
+                    bits[index >> 3] |= mask
+                    present = False
+            if not present:
+                self.count += 1
+        return present
+    
+    def __contains__(self, key: int) -> bool:
+        bits = self.bits
+        return all(bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(key))
 
 class AdvancedTwitterScraper:
     def __init__(self, method: str = "selenium", use_proxy: bool = False, 
-                 headless: bool = True, delay_range: tuple = (2, 5)):
+                 headless: bool = True, delay_range: tuple = (2, 5),
+                 seen_file: Optional[str] = None, scraped_ids: Optional[BloomFilter] = None):
         """
         Initialize advanced Twitter scraper.
         
@@ -70,15 +357,27 @@ class AdvancedTwitterScraper:
             use_proxy (bool): Use proxy rotation
             headless (bool): Run browser in headless mode
             delay_range (tuple): Random delay range between actions
+            seen_file (str): Persist seen tweet ids in this Bloom filter file across runs
+            scraped_ids (BloomFilter): Filter shared with other scrapers; the caller closes it
         """
         self.method = method
         self.use_proxy = use_proxy
         self.headless = headless
         self.delay_range = delay_range
+        # Current base delay, adapted AIMD-style to how the timeline responds
+        self.current_delay = delay_range[0]
         self.driver = None
+        self.wait = None
         self.session = None
-        self.scraped_ids: Set[str] = set()
+        self.request_headers: Dict[str, str] = {}
+        # A filter passed in is owned by the caller (see scrape_accounts)
+        self._owns_scraped_ids = scraped_ids is None
+        if scraped_ids is None:
+            scraped_ids = BloomFilter.open(seen_file) if seen_file else BloomFilter()
+        self.scraped_ids = scraped_ids
         self.user_agents = self.get_user_agents()
+        # One user agent per scraper lifetime, shared by the browser and HTTP headers
+        self.user_agent = self.get_random_user_agent()
         self.proxies = self.load_proxies() if use_proxy else []
         self.current_proxy_index = 0
         
@@ -184,14 +483,12 @@ class AdvancedTwitterScraper:
             chrome_options.add_argument('--disable-gpu')
             chrome_options.add_argument('--disable-extensions')
             chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-images')
-            chrome_options.add_argument('--disable-javascript')
             chrome_options.add_argument('--disable-web-security')
             chrome_options.add_argument('--disable-features=VizDisplayCompositor')
             chrome_options.add_argument('--disable-ipc-flooding-protection')
             
-            # Random user agent
-            user_agent = self.get_random_user_agent()
+            # User agent pinned for this scraper
+            user_agent = self.user_agent
             chrome_options.add_argument(f'--user-agent={user_agent}')
             
             # Proxy support
@@ -205,7 +502,7 @@ class AdvancedTwitterScraper:
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
-            # Disable loading of images and CSS
+            # Disable image loading; JavaScript must stay on for the timeline and JS extractor
             prefs = {
                 "profile.managed_default_content_settings.images": 2,
                 "profile.default_content_setting_values.notifications": 2,
@@ -213,13 +510,18 @@ class AdvancedTwitterScraper:
             }
             chrome_options.add_experimental_option("prefs", prefs)
             
-            service = Service(ChromeDriverManager().install())
+            service = Service(get_driver_path())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             
             # Execute script to hide webdriver property
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
+            # Block media, fonts and trackers at the network layer
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+            
             self.driver.set_window_size(1920, 1080)
+            self.wait = WebDriverWait(self.driver, 15)
             print(f"✅ Selenium WebDriver initialized with user agent: {user_agent[:50]}...")
             
         except Exception as e:
@@ -228,61 +530,72 @@ class AdvancedTwitterScraper:
     
     def setup_requests(self):
         """
-        Setup requests session with retry strategy.
+        Attach to the shared requests session; headers are kept per scraper.
         """
-        self.session = requests.Session()
+        self.session = get_shared_session()
         
-        # Retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        
-        # Set headers
-        self.session.headers.update({
-            'User-Agent': self.get_random_user_agent(),
+        # Per-instance headers, passed with each request
+        self.request_headers = {
+            'User-Agent': self.user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
+        }
         
         print("✅ Requests session initialized")
     
     def random_delay(self, multiplier: float = 1.0):
         """
-        Add random delay with optional multiplier.
+        Add random delay (jittered around the adaptive base delay) with optional multiplier.
+        The jittered delay never drops below delay_range[0], the user's --delay-min.
         """
-        delay = random.uniform(*self.delay_range) * multiplier
+        delay = max(self.delay_range[0], random.uniform(self.current_delay * 0.8, self.current_delay * 1.2)) * multiplier
         time.sleep(delay)
     
-    def generate_tweet_id(self, tweet_data: Dict) -> str:
+    def speed_up(self):
         """
-        Generate unique ID for tweet based on content.
+        Shrink the base delay after a productive scroll (multiplicative, floored at delay_range[0]).
         """
-        content = f"{tweet_data.get('text', '')}{tweet_data.get('created_at', '')}"
-        return hashlib.md5(content.encode()).hexdigest()[:16]
+        self.current_delay = max(self.delay_range[0], self.current_delay * 0.9)
+    
+    def back_off(self):
+        """
+        Double the base delay when the page stalls or redirects to login (capped at MAX_DELAY).
+        """
+        self.current_delay = min(MAX_DELAY, max(self.delay_range[1], self.current_delay * 2))
+    
+    def generate_tweet_id(self, tweet_data: Dict) -> int:
+        """
+        Generate unique 64-bit ID for tweet based on content.
+        """
+        key = self.dedup_key(tweet_data)
+        if xxhash:
+            return xxhash.xxh3_64_intdigest(key)
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+    
+    @staticmethod
+    def dedup_key(tweet_data: Dict) -> bytes:
+        """
+        Raw content key used for deduplication (text + timestamp).
+        """
+        return f"{tweet_data.get('text', '')}{tweet_data.get('created_at', '')}".encode()
     
     def is_duplicate(self, tweet_data: Dict) -> bool:
         """
         Check if tweet is duplicate.
         """
-        tweet_id = self.generate_tweet_id(tweet_data)
-        if tweet_id in self.scraped_ids:
+        if self.scraped_ids.add(self.generate_tweet_id(tweet_data)):
             self.stats['duplicates_skipped'] += 1
             return True
-        self.scraped_ids.add(tweet_id)
         return False
     
-    def scrape_with_selenium(self, username: str, count: int) -> List[Dict]:
+    def scrape_with_selenium(self, username: str, count: int,
+                             on_batch: Optional[Callable[[List[Dict]], None]] = None) -> List[Dict]:
         """
         Scrape tweets using Selenium method - Twitter/X.com exclusive.
+        on_batch, if given, receives each scroll's new tweets as soon as they are extracted.
         """
         username = username.lstrip('@')
         # Support both twitter.com and x.com URLs
@@ -297,15 +610,13 @@ class AdvancedTwitterScraper:
             # Check if we're redirected to login (indicates private/suspended account)
             if "login" in self.driver.current_url.lower():
                 print(f"⚠️  Account @{username} may be private or suspended")
+                self.back_off()
                 return []
             
             # Wait for tweets to load
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweet"]'))
-            )
+            self.wait.until(EC.presence_of_element_located(TWEET_SELECTOR))
             
             tweets = []
-            last_count = 0
             no_new_tweets_count = 0
             max_scrolls = count // 10 + 20  # Dynamic scroll limit
             
@@ -314,40 +625,45 @@ class AdvancedTwitterScraper:
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 self.random_delay()
                 
-                # Get current tweets
-                tweet_elements = self.driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
+                # Extract all newly rendered tweets in a single script call
+                raw_tweets = self.driver.execute_script(JS_EXTRACT_TWEETS)
+                batch_start = len(tweets)
+                # One timestamp per scroll batch
+                scraped_at = datetime.now().isoformat()
                 
-                # Extract new tweets
-                for element in tweet_elements[last_count:]:
+                for raw in raw_tweets:
                     if len(tweets) >= count:
                         break
                     
-                    tweet_data = self.extract_tweet_data_selenium(element)
+                    tweet_data = self.build_tweet_data(raw, scraped_at)
                     if tweet_data and not self.is_duplicate(tweet_data):
                         tweets.append(tweet_data)
                         self.stats['total_scraped'] += 1
                 
                 current_count = len(tweets)
-                print(f"📊 [Selenium] Scroll {scroll+1}: {current_count}/{count} tweets")
+                if on_batch and current_count > batch_start:
+                    on_batch(tweets[batch_start:])
+                logger.info("📊 [Selenium] @%s scroll %d: %d/%d tweets", username, scroll + 1, current_count, count)
                 
                 # Check if we have enough tweets
                 if current_count >= count:
                     break
                 
-                # Check if no new tweets were loaded
-                if current_count == last_count:
+                # Stalls are judged by what the page rendered, not by what survived the
+                # seen-filter, so a rerun keeps scrolling past tweets it already has
+                if not raw_tweets:
                     no_new_tweets_count += 1
                     if no_new_tweets_count >= 3:
-                        print("⚠️  No new tweets loaded, stopping...")
+                        logger.info("⚠️  No new tweets loaded for @%s, stopping...", username)
                         break
+                    self.back_off()
                 else:
                     no_new_tweets_count = 0
-                
-                last_count = current_count
+                    self.speed_up()
                 
                 # Longer delay every 10 scrolls
                 if (scroll + 1) % 10 == 0:
-                    print(f"🔄 Taking extended break after {scroll+1} scrolls...")
+                    logger.info("🔄 Taking extended break after %d scrolls...", scroll + 1)
                     time.sleep(random.uniform(10, 20))
             
             return tweets[:count]
@@ -357,11 +673,54 @@ class AdvancedTwitterScraper:
             self.stats['errors'] += 1
             return []
     
-    def extract_tweet_data_selenium(self, tweet_element) -> Optional[Dict]:
+    def build_tweet_data(self, raw: Dict, scraped_at: Optional[str] = None) -> Optional[Dict]:
+        """
+        Build tweet data from the fields returned by JS_EXTRACT_TWEETS.
+        scraped_at is shared by the whole scroll batch; it also stands in for a missing tweet timestamp.
+        """
+        text = raw.get('text') or ""
+        
+        # Skip if no text
+        if not text:
+            return None
+        
+        scraped_at = scraped_at or datetime.now().isoformat()
+        tweet_data = {
+            'text': text,
+            'created_at': raw.get('created_at') or scraped_at,
+            'time_text': raw.get('time_text') or "",
+            'metrics': {
+                'replies': self.extract_number_from_text(raw.get('replies')),
+                'retweets': self.extract_number_from_text(raw.get('retweets')),
+                'likes': self.extract_number_from_text(raw.get('likes')),
+                'views': 0
+            }
+        }
+        
+        # Get tweet URL
+        href = raw.get('url')
+        if href:
+            tweet_data['url'] = href
+            if '/status/' in href:
+                tweet_data['id'] = href.split('/status/')[-1].split('?')[0]
+        
+        # Extract hashtags and mentions
+        words = text.split()
+        tweet_data['hashtags'] = [word[1:] for word in words if word.startswith('#')]
+        tweet_data['mentions'] = [word[1:] for word in words if word.startswith('@')]
+        
+        # Add scraping metadata
+        tweet_data['scraped_at'] = scraped_at
+        tweet_data['scraping_method'] = 'selenium'
+        
+        return tweet_data
+    
+    def extract_tweet_data_selenium(self, tweet_element, scraped_at: Optional[str] = None) -> Optional[Dict]:
         """
         Extract tweet data using Selenium.
         """
         try:
+            scraped_at = scraped_at or datetime.now().isoformat()
             tweet_data = {}
             
             # Get tweet text
@@ -381,26 +740,20 @@ class AdvancedTwitterScraper:
                 tweet_data['created_at'] = time_element.get_attribute('datetime')
                 tweet_data['time_text'] = time_element.text
             except:
-                tweet_data['created_at'] = datetime.now().isoformat()
+                tweet_data['created_at'] = scraped_at
                 tweet_data['time_text'] = ""
             
             # Get metrics
             metrics = {'replies': 0, 'retweets': 0, 'likes': 0, 'views': 0}
             
-            # Extract engagement metrics
-            metric_selectors = {
-                'replies': '[data-testid="reply"]',
-                'retweets': '[data-testid="retweet"]',
-                'likes': '[data-testid="like"]'
-            }
-            
-            for metric, selector in metric_selectors.items():
-                try:
-                    element = tweet_element.find_element(By.CSS_SELECTOR, selector)
-                    aria_label = element.get_attribute('aria-label') or ""
-                    metrics[metric] = self.extract_number_from_text(aria_label)
-                except:
-                    pass
+            # Extract engagement metrics with a single script call
+            try:
+                labels = self.driver.execute_script(JS_METRICS, tweet_element) or {}
+                for testid, metric in _METRIC_TESTIDS.items():
+                    if testid in labels:
+                        metrics[metric] = self.extract_number_from_text(labels[testid])
+            except:
+                pass
             
             tweet_data['metrics'] = metrics
             
@@ -423,7 +776,7 @@ class AdvancedTwitterScraper:
                 tweet_data['mentions'] = [word[1:] for word in words if word.startswith('@')]
             
             # Add scraping metadata
-            tweet_data['scraped_at'] = datetime.now().isoformat()
+            tweet_data['scraped_at'] = scraped_at
             tweet_data['scraping_method'] = 'selenium'
             
             return tweet_data
@@ -435,31 +788,28 @@ class AdvancedTwitterScraper:
         """
         Extract number from text with K/M/B suffixes.
         """
-        import re
-        
         if not text:
             return 0
         
-        # Find numbers in the text
-        numbers = re.findall(r'[\d,\.]+[KMB]?', text.upper())
-        if not numbers:
-            return 0
+        # Fast path: aria-labels usually look like "1,234 Likes. Like"
+        try:
+            return int(text.split(' ', 1)[0].replace(',', ''))
+        except ValueError:
+            pass
         
-        num_str = numbers[0].replace(',', '')
+        # Find the first number in the text
+        match = _NUMBER_RE.search(text)
+        if not match:
+            return 0
         
+        number, suffix = match.groups()
         try:
-            if num_str.endswith('K'):
-                return int(float(num_str[:-1]) * 1000)
-            elif num_str.endswith('M'):
-                return int(float(num_str[:-1]) * 1000000)
-            elif num_str.endswith('B'):
-                return int(float(num_str[:-1]) * 1000000000)
-            else:
-                return int(float(num_str))
-        except:
+            return int(float(number.replace(',', '')) * _SUFFIX_MULTIPLIERS[suffix.upper()])
+        except ValueError:
             return 0
     
-    def scrape_user_tweets(self, username: str, count: int = 100) -> List[Dict]:
+    def scrape_user_tweets(self, username: str, count: int = 100,
+                           on_batch: Optional[Callable[[List[Dict]], None]] = None) -> List[Dict]:
         """
         Main method to scrape tweets using selected method.
         """
@@ -468,40 +818,73 @@ class AdvancedTwitterScraper:
         tweets = []
         
         if self.method == 'selenium':
-            tweets = self.scrape_with_selenium(username, count)
+            tweets = self.scrape_with_selenium(username, count, on_batch)
         elif self.method == 'hybrid':
             # Try selenium first, fallback to other methods if needed
-            tweets = self.scrape_with_selenium(username, count)
+            tweets = self.scrape_with_selenium(username, count, on_batch)
         
         return tweets
     
+    def jsonl_writer(self, filename: str, append: bool = False) -> Callable[[List[Dict]], None]:
+        """
+        Return an on_batch callback that streams tweets into a JSONL file while scraping.
+        In append mode, tweets already in the file are marked as seen so they are
+        skipped at ingest instead of being deduplicated when saving.
+        """
+        if append and os.path.exists(filename):
+            with open(filename, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        self.scraped_ids.add(self.generate_tweet_id(load_json(line)))
+        mode = 'ab' if append else 'wb'
+        
+        def write(batch: List[Dict]):
+            nonlocal mode
+            with open(filename, mode) as f:
+                f.write(b''.join(dump_json(tweet) + b'\n' for tweet in batch))
+            mode = 'ab'
+        
+        return write
+    
     def save_tweets(self, tweets: List[Dict], filename: str, append: bool = False):
         """
         Save tweets to file with optional append mode.
+        Files ending in .jsonl hold one tweet per line and are appended in place;
+        other files are written as a single JSON array.
         """
         mode = 'a' if append and os.path.exists(filename) else 'w'
         
         try:
+            if filename.endswith('.jsonl'):
+                if mode == 'a':
+                    # Stream existing lines; only the new tweets are written
+                    seen = BloomFilter(capacity=len(tweets) + 100_000)
+                    with open(filename, 'rb') as f:
+                        for line in f:
+                            if line.strip():
+                                seen.add(self.generate_tweet_id(load_json(line)))
+                    tweets = [t for t in tweets if not seen.add(self.generate_tweet_id(t))]
+                
+                with open(filename, mode + 'b') as f:
+                    f.write(b''.join(dump_json(tweet) + b'\n' for tweet in tweets))
+                
+                print(f"💾 {'Appended' if mode == 'a' else 'Saved'} {len(tweets)} tweets to {filename}")
+                return
+            
             if mode == 'a':
                 # Load existing data and merge
-                with open(filename, 'r', encoding='utf-8') as f:
-                    existing_tweets = json.load(f)
+                with open(filename, 'rb') as f:
+                    existing_tweets = load_json(f.read())
                 
-                # Combine and deduplicate
-                all_tweets = existing_tweets + tweets
-                unique_tweets = []
-                seen_ids = set()
+                # Existing tweets were deduplicated when written; only filter the new ones
+                seen = BloomFilter(capacity=len(existing_tweets) + len(tweets))
+                for tweet in existing_tweets:
+                    seen.add(self.generate_tweet_id(tweet))
                 
-                for tweet in all_tweets:
-                    tweet_id = self.generate_tweet_id(tweet)
-                    if tweet_id not in seen_ids:
-                        unique_tweets.append(tweet)
-                        seen_ids.add(tweet_id)
-                
-                tweets = unique_tweets
+                tweets = existing_tweets + [t for t in tweets if not seen.add(self.generate_tweet_id(t))]
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(tweets, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb') as f:
+                f.write(dump_json(tweets, indent=True))
             
             print(f"💾 Saved {len(tweets)} tweets to {filename}")
             
@@ -529,26 +912,70 @@ class AdvancedTwitterScraper:
         """
         if self.driver:
             self.driver.quit()
-        if self.session:
-            self.session.close()
+        if self._owns_scraped_ids:
+            self.scraped_ids.close()
+        # The shared session outlives individual scrapers; see close_shared_session()
+        self.session = None
         print("🔒 Scraper closed")
 
+def scrape_accounts(usernames: List[str], count: int, workers: int = 2,
+                    on_complete: Optional[Callable] = None, **scraper_kwargs) -> Dict[str, List[Dict]]:
+    """
+    Scrape several accounts concurrently.
+    Each worker thread owns one scraper (and Selenium driver) for its whole lifetime
+    and pulls the next username as soon as it finishes, so one slow account
+    does not stall the rest. on_complete(scraper, username, tweets) runs in the
+    worker thread after each account. All scrapers share one seen-tweet filter,
+    opened here once so workers never race to create the same --seen-file.
+    """
+    local = threading.local()
+    scrapers = []
+    lock = threading.Lock()
+    seen_file = scraper_kwargs.pop('seen_file', None)
+    scraped_ids = BloomFilter.open(seen_file) if seen_file else BloomFilter()
+    start_log_listener()
+    
+    def worker(username: str):
+        scraper = getattr(local, 'scraper', None)
+        if scraper is None:
+            scraper = local.scraper = AdvancedTwitterScraper(scraped_ids=scraped_ids, **scraper_kwargs)
+            with lock:
+                scrapers.append(scraper)
+        tweets = scraper.scrape_user_tweets(username, count)
+        if on_complete:
+            on_complete(scraper, username, tweets)
+        return username, tweets
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(usernames)))) as executor:
+            return dict(executor.map(worker, usernames))
+    finally:
+        for scraper in scrapers:
+            scraper.print_stats()
+            scraper.close()
+        scraped_ids.close()
+        stop_log_listener()
+
 def main():
     parser = argparse.ArgumentParser(description='Advanced Twitter scraper for high-volume data collection')
-    parser.add_argument('--username', '-u', required=True, help='Twitter username (without @)')
+    parser.add_argument('--username', '-u', required=True, nargs='+', help='Twitter username(s) (without @)')
     parser.add_argument('--count', '-c', type=int, default=100, help='Number of tweets to scrape')
     parser.add_argument('--method', '-m', choices=['selenium', 'requests', 'hybrid'], default='selenium', help='Scraping method')
-    parser.add_argument('--output', '-o', help='Output JSON file')
+    parser.add_argument('--output', '-o', help='Output file (.jsonl for JSON Lines, otherwise a JSON array)')
+    parser.add_argument('--format', '-f', choices=['json', 'jsonl'], default='json', help='Format for auto-generated output filenames (jsonl streams one tweet per line)')
     parser.add_argument('--headless', action='store_true', help='Run browser in headless mode')
     parser.add_argument('--proxy', action='store_true', help='Use proxy rotation')
     parser.add_argument('--delay-min', type=float, default=2.0, help='Minimum delay between actions')
     parser.add_argument('--delay-max', type=float, default=5.0, help='Maximum delay between actions')
     parser.add_argument('--append', action='store_true', help='Append to existing file')
+    parser.add_argument('--workers', '-w', type=int, default=2, help='Concurrent browsers when scraping several usernames')
+    parser.add_argument('--seen-file', help='Bloom filter file that remembers scraped tweets across runs (e.g. ids.bloom)')
     
     args = parser.parse_args()
+    usernames = [u.lstrip('@') for u in args.username]
     
     print(f"🚀 Advanced Twitter Scraper")
-    print(f"👤 Target: @{args.username}")
+    print(f"👤 Target: {', '.join('@' + u for u in usernames)}")
     print(f"📊 Count: {args.count:,} tweets")
     print(f"🔧 Method: {args.method}")
     print(f"🤖 Headless: {args.headless}")
@@ -556,6 +983,14 @@ def main():
     print(f"⏱️  Delay: {args.delay_min}-{args.delay_max}s")
     print("=" * 60)
     
+    start_log_listener()
+    if len(usernames) > 1:
+        try:
+            run_batch(args, usernames)
+        finally:
+            stop_log_listener()
+        return
+    
     scraper = None
     try:
         # Initialize scraper
@@ -563,22 +998,30 @@ def main():
             method=args.method,
             use_proxy=args.proxy,
             headless=args.headless,
-            delay_range=(args.delay_min, args.delay_max)
+            delay_range=(args.delay_min, args.delay_max),
+            seen_file=args.seen_file
         )
         
+        # Generate filename
+        if args.output:
+            filename = args.output
+        else:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"{usernames[0]}_advanced_{timestamp}.{args.format}"
+        
+        # JSONL output is written scroll by scroll, so results land on disk while scraping
+        streaming = filename.endswith('.jsonl')
+        on_batch = scraper.jsonl_writer(filename, args.append) if streaming else None
+        
         # Scrape tweets
-        tweets = scraper.scrape_user_tweets(args.username, args.count)
+        tweets = scraper.scrape_user_tweets(usernames[0], args.count, on_batch)
         
         if tweets:
-            # Generate filename
-            if args.output:
-                filename = args.output
-            else:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{args.username}_advanced_{timestamp}.json"
-            
             # Save results
-            scraper.save_tweets(tweets, filename, args.append)
+            if streaming:
+                print(f"💾 Streamed {len(tweets)} tweets to {filename}")
+            else:
+                scraper.save_tweets(tweets, filename, args.append)
             
             # Print summary
             print(f"\n✅ Successfully scraped {len(tweets)} tweets")
@@ -600,6 +1043,43 @@ def main():
     finally:
         if scraper:
             scraper.close()
+        close_shared_session()
+        stop_log_listener()
+
+def run_batch(args, usernames: List[str]):
+    """
+    Scrape several usernames concurrently and save one file per account.
+    """
+    if args.output:
+        print("ℹ️  --output is ignored when scraping several usernames")
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    def save(scraper: AdvancedTwitterScraper, username: str, tweets: List[Dict]):
+        if not tweets:
+            print(f"❌ No tweets were scraped for @{username}")
+            return
+        scraper.save_tweets(tweets, f"{username}_advanced_{timestamp}.{args.format}", args.append)
+    
+    try:
+        results = scrape_accounts(
+            usernames, args.count, workers=args.workers, on_complete=save,
+            method=args.method,
+            use_proxy=args.proxy,
+            headless=args.headless,
+            delay_range=(args.delay_min, args.delay_max),
+            seen_file=args.seen_file
+        )
+        
+        total = sum(len(tweets) for tweets in results.values())
+        print(f"\n✅ Successfully scraped {total} tweets from {len(results)} accounts")
+    
+    except KeyboardInterrupt:
+        print("\n⚠️  Scraping interrupted by user")
+    except Exception as e:
+        print(f"❌ Scraping failed: {e}")
+    finally:
+        close_shared_session()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
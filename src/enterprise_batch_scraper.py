@@ -21,23 +21,29 @@ Features:
 Usage:
     python enterprise_batch_scraper.py --users users.txt --output results.json
     python enterprise_batch_scraper.py --config config.json --format csv
+    python enterprise_batch_scraper.py --users users.txt --method api
 """
 
 import os
+import sys
+import re
 import json
+import asyncio
 import csv
 import time
 import random
 import argparse
 import threading
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Iterator, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urljoin
+from contextlib import contextmanager
 import queue
 import logging
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from dataclasses import dataclass
+from collections import deque
 
 try:
     from selenium import webdriver
@@ -53,12 +59,91 @@ except ImportError:
     exit(1)
 
 try:
-    from bs4 import BeautifulSoup
+    from selectolax.lexbor import LexborHTMLParser
 except ImportError:
-    print("Error: BeautifulSoup not installed. Install with: pip install beautifulsoup4")
-    exit(1)
+    LexborHTMLParser = None  # Falls back to per-element Selenium extraction
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # Only needed for --method api
+
+# X API v2, used by the browserless 'api' method
+API_BASE_URL = "https://api.twitter.com/2"
+API_TWEET_FIELDS = "created_at,public_metrics,entities"
+# /users/by accepts at most this many usernames per request
+API_USERS_LOOKUP_BATCH = 100
+# Client-side pacing from X's documented app-auth limits, per 15-minute window
+API_RATE_WINDOW = 15 * 60
+API_USERS_LOOKUP_LIMIT = 300   # GET /2/users/by
+API_USER_TWEETS_LIMIT = 1500   # GET /2/users/:id/tweets
+
+# First number in a metric label, e.g. "1,234 Likes" or "12.3K"
+_NUMBER_RE = re.compile(r'(\d[\d,.]*)([KMB]?)', re.IGNORECASE)
+_SUFFIX_MULTIPLIERS = {'': 1, 'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+# Hashtags and mentions at the start of a word, captured as (sigil, name)
+_TAG_RE = re.compile(r'(?<!\S)([#@])(\w+)')
+# Valid X handle; one bad name makes a whole /users/by request fail with 400
+_USERNAME_RE = re.compile(r'^[A-Za-z0-9_]{1,15}$')
+
+# Profile messages for missing or suspended accounts (straight or curly apostrophe)
+_DEAD_ACCOUNT_RE = re.compile(r"this account doesn.?t exist|account suspended", re.IGNORECASE)
+
+# Subresources the scraper never needs; blocked through CDP to save bandwidth
+BLOCKED_URL_PATTERNS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.mp4', '*.m3u8', '*.m4s', '*.woff', '*.woff2', '*.ttf',
+    '*google-analytics*', '*doubleclick*', '*googletagmanager*'
+]
+
+# Engagement buttons in a tweet, by data-testid
+METRIC_TESTIDS = {'reply': 'replies', 'retweet': 'retweets', 'like': 'likes'}
+
+# Column order of CSV output; one row per tweet, or one row per user without tweets
+CSV_FIELDS = (
+    'username', 'success', 'scraped_at', 'tweet_text', 'tweet_created_at',
+    'tweet_time_text', 'replies', 'retweets', 'likes', 'error_message'
+)
+
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# datetime.fromisoformat accepts a trailing 'Z' from Python 3.11 on
+if sys.version_info >= (3, 11):
+    parse_timestamp = datetime.fromisoformat
+else:
+    def parse_timestamp(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
 
-@dataclass
+# ChromeDriver binary path, resolved once per process
+_DRIVER_PATH: Optional[str] = None
+_DRIVER_PATH_LOCK = threading.Lock()
+
+def get_driver_path() -> str:
+    """Resolve the ChromeDriver path on first use and reuse it for every driver"""
+    global _DRIVER_PATH
+    with _DRIVER_PATH_LOCK:
+        if _DRIVER_PATH is None:
+            _DRIVER_PATH = ChromeDriverManager().install()
+    return _DRIVER_PATH
+
+class RequestPacer:
+    """Sliding-window pacer for coroutines on one event loop"""
+    
+    def __init__(self, burst: int, window: float):
+        self.window = window
+        self.sent = deque(maxlen=burst)
+    
+    async def wait(self):
+        """Sleep until another request fits in the window, then record it"""
+        while len(self.sent) == self.sent.maxlen:
+            delay = self.sent[0] + self.window - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        self.sent.append(time.monotonic())
+
+@dataclass(**DATACLASS_OPTIONS)
 class UserConfig:
     """Configuration for a single user"""
     username: str
@@ -71,7 +156,7 @@ class UserConfig:
         if self.tags is None:
             self.tags = []
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ScrapingResult:
     """Result of scraping a single user"""
     username: str
@@ -86,12 +171,25 @@ class ScrapingResult:
             self.scraped_at = datetime.now().isoformat()
         if self.tweets is None:
             self.tweets = []
+    
+    def to_dict(self) -> Dict:
+        """Flat dict for serialization; tweets are already plain dicts, so no deep copy"""
+        return {
+            'username': self.username,
+            'success': self.success,
+            'tweet_count': self.tweet_count,
+            'error_message': self.error_message,
+            'scraped_at': self.scraped_at,
+            'tweets': self.tweets
+        }
 
 class EnterpriseTwitterScraper:
     """Enterprise-grade Twitter scraper for high-volume batch processing"""
     
     def __init__(self, max_workers: int = None, headless: bool = True, 
-                 output_dir: str = "data", log_level: str = "INFO"):
+                 output_dir: str = "data", log_level: str = "INFO",
+                 method: str = "selenium", bearer_token: Optional[str] = None,
+                 recent_only: bool = False):
         """
         Initialize the enterprise scraper.
         
@@ -100,8 +198,17 @@ class EnterpriseTwitterScraper:
             headless: Run browsers in headless mode
             output_dir: Directory for output files
             log_level: Logging level
+            method: 'selenium' drives Chrome; 'api' calls the X API v2 over HTTP
+            bearer_token: X API bearer token (defaults to the first TWITTER_BEARER_TOKEN)
+            recent_only: Keep only tweets from the last 24 hours
         """
         self.headless = headless
+        self.method = method
+        self.recent_only = recent_only
+        # Recency cutoff shared by every tweet of the current batch (see recent_cutoff)
+        self.recent_cutoff_time = None
+        self.bearer_token = bearer_token or os.getenv("TWITTER_BEARER_TOKEN", "").split(",")[0].strip()
+        self.api_pacers = {}
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
@@ -117,9 +224,18 @@ class EnterpriseTwitterScraper:
         self.success_count = 0
         self.total_tweets = 0
         
-        # Rate limiting
-        self.request_times = defaultdict(list)
-        self.rate_limit_lock = threading.Lock()
+        # Every finished user is appended here, so an interrupted run can resume
+        self.checkpoint_path = self.output_dir / "checkpoint.jsonl"
+        self._checkpoint = None
+        
+        # Rate limiting: each worker thread keeps its own request timestamps, so no lock is needed
+        self._local = threading.local()
+        
+        # Idle drivers reused across users; at most one per worker thread is ever created
+        self.driver_pool = queue.Queue()
+        
+        # Worker threads shared by every batch of a scrape_users run
+        self.executor = None
         
         self.logger.info(f"Initialized enterprise scraper with {self.max_workers} workers")
     
@@ -146,6 +262,22 @@ class EnterpriseTwitterScraper:
         else:
             return min(20, total_users // 50)
     
+    def adapt_batch_size(self, batch_results: List[ScrapingResult], max_batch_size: int) -> int:
+        """Grow the batch by 25% while it runs clean, shrink it by 25% when failures pile up"""
+        batch_size = self.dynamic_batch_size
+        error_rate = sum(1 for r in batch_results if not r.success) / max(1, len(batch_results))
+        
+        if error_rate > 0.10:
+            new_size = max(1, int(batch_size * 0.75))
+        elif error_rate < 0.05:
+            new_size = min(max_batch_size, max(batch_size + 1, int(batch_size * 1.25)))
+        else:
+            new_size = batch_size
+        
+        if new_size != batch_size:
+            self.logger.info(f"Batch size {batch_size} -> {new_size} (error rate {error_rate:.0%})")
+        return new_size
+    
     def calculate_delay_range(self, total_users: int) -> tuple:
         """Calculate delay range based on user count to avoid rate limiting"""
         if total_users < 7:
@@ -198,39 +330,84 @@ class EnterpriseTwitterScraper:
         options.add_experimental_option("prefs", prefs)
         
         try:
-            service = Service(ChromeDriverManager().install())
+            service = Service(get_driver_path())
             driver = webdriver.Chrome(service=service, options=options)
             
             # Execute script to hide webdriver property
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
+            # Block media, fonts and trackers at the network layer; prefs above only stop rendering
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+            driver.execute_cdp_cmd('Page.setDownloadBehavior', {'behavior': 'deny'})
+            
             driver.set_window_size(1920, 1080)
             return driver
         except Exception as e:
             self.logger.error(f"Failed to create driver: {e}")
             raise
     
+    @contextmanager
+    def pooled_driver(self) -> Iterator[webdriver.Chrome]:
+        """Check out a pooled driver; drivers that raised are quit instead of returned"""
+        try:
+            driver = self.driver_pool.get_nowait()
+        except queue.Empty:
+            driver = self.create_driver()
+        
+        try:
+            yield driver
+        except BaseException:
+            self.quit_driver(driver)
+            raise
+        
+        try:
+            # Reset state so the next user starts from a clean session
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception as e:
+            self.logger.debug(f"Discarding driver that failed to reset: {e}")
+            self.quit_driver(driver)
+        else:
+            self.driver_pool.put(driver)
+    
+    def quit_driver(self, driver: webdriver.Chrome):
+        """Quit a driver, ignoring errors from an already dead browser"""
+        try:
+            driver.quit()
+        except:
+            pass
+    
+    def close_pool(self):
+        """Quit every idle driver in the pool"""
+        while True:
+            try:
+                driver = self.driver_pool.get_nowait()
+            except queue.Empty:
+                break
+            self.quit_driver(driver)
+    
     def apply_rate_limiting(self, delay_range: tuple):
         """Apply intelligent rate limiting"""
         current_time = time.time()
-        thread_id = threading.current_thread().ident
+        request_times = getattr(self._local, 'request_times', None)
+        if request_times is None:
+            request_times = self._local.request_times = deque()
         
-        with self.rate_limit_lock:
-            # Clean old requests (older than 1 minute)
-            cutoff_time = current_time - 60
-            self.request_times[thread_id] = [
-                t for t in self.request_times[thread_id] if t > cutoff_time
-            ]
-            
-            # Check if we need to slow down
-            recent_requests = len(self.request_times[thread_id])
-            if recent_requests > 10:  # More than 10 requests per minute
-                extra_delay = recent_requests * 0.5
-                delay = delay_range[1] + extra_delay
-            else:
-                delay = random.uniform(*delay_range)
-            
-            self.request_times[thread_id].append(current_time)
+        # Clean old requests (older than 1 minute); timestamps are in order, so pop from the left
+        cutoff_time = current_time - 60
+        while request_times and request_times[0] <= cutoff_time:
+            request_times.popleft()
+        
+        # Check if we need to slow down
+        recent_requests = len(request_times)
+        if recent_requests > 10:  # More than 10 requests per minute
+            extra_delay = recent_requests * 0.5
+            delay = delay_range[1] + extra_delay
+        else:
+            delay = random.uniform(*delay_range)
+        
+        request_times.append(current_time)
         
         time.sleep(delay)
     
@@ -241,50 +418,160 @@ class EnterpriseTwitterScraper:
         
         self.logger.info(f"Starting scrape for @{username} ({tweet_count} tweets)")
         
-        driver = None
         try:
             # Apply rate limiting
             self.apply_rate_limiting(delay_range)
             
-            # Create driver
-            driver = self.create_driver()
-            
-            # Navigate to user profile on Twitter/X.com
-            url = f"https://x.com/{username}"
-            driver.get(url)
-            
-            # Wait for tweets to load (like advanced scraper)
-            try:
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweet"]'))
-                )
-            except TimeoutException:
-                self.logger.warning(f"No tweets found for @{username} - may be private or suspended")
-                # Continue anyway to check for account status
-            
-            # Check if profile exists or account issues
-            page_source = driver.page_source.lower()
-            if "this account doesn't exist" in page_source or "account suspended" in page_source:
-                return ScrapingResult(
-                    username=username,
-                    success=False,
-                    tweet_count=0,
-                    error_message="Account doesn't exist or is suspended"
-                )
-            
-            # Check if redirected to login (private account)
-            if "login" in driver.current_url.lower():
+            # Reuse a pooled driver instead of starting Chrome per user
+            with self.pooled_driver() as driver:
+                # Navigate to user profile on Twitter/X.com
+                url = f"https://x.com/{username}"
+                driver.get(url)
+                
+                # Wait for tweets to load (like advanced scraper)
+                try:
+                    WebDriverWait(driver, 15).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="tweet"]'))
+                    )
+                    tweets_loaded = True
+                except TimeoutException:
+                    self.logger.warning(f"No tweets found for @{username} - may be private or suspended")
+                    tweets_loaded = False
+                    # Continue anyway to check for account status
+                
+                # Check if profile exists or account issues; a rendered timeline rules both out
+                if not tweets_loaded and _DEAD_ACCOUNT_RE.search(driver.page_source):
+                    return ScrapingResult(
+                        username=username,
+                        success=False,
+                        tweet_count=0,
+                        error_message="Account doesn't exist or is suspended"
+                    )
+                
+                # Check if redirected to login (private account)
+                if "login" in driver.current_url.lower():
+                    return ScrapingResult(
+                        username=username,
+                        success=False,
+                        tweet_count=0,
+                        error_message="Account is private or requires login"
+                    )
+                
+                # Scroll and collect tweets
+                tweets = self.collect_tweets(driver, tweet_count, delay_range)
+                
+                self.logger.info(f"Successfully scraped {len(tweets)} tweets for @{username}")
+                
                 return ScrapingResult(
                     username=username,
-                    success=False,
-                    tweet_count=0,
-                    error_message="Account is private or requires login"
+                    success=True,
+                    tweet_count=len(tweets),
+                    tweets=tweets
                 )
             
-            # Scroll and collect tweets
-            tweets = self.collect_tweets(driver, tweet_count, delay_range)
+        except Exception as e:
+            self.logger.error(f"Error scraping @{username}: {e}")
+            return ScrapingResult(
+                username=username,
+                success=False,
+                tweet_count=0,
+                error_message=str(e)
+            )
+    
+    @staticmethod
+    def _rate_limit_wait(headers) -> int:
+        """Seconds until x-rate-limit-reset, defaulting to a full window when missing"""
+        try:
+            reset = int(headers.get("x-rate-limit-reset", 0))
+        except (TypeError, ValueError):
+            reset = 0
+        if not reset:
+            return API_RATE_WINDOW
+        return max(1, reset - int(time.time()))
+    
+    async def api_get(self, session, endpoint: str, path: str, params: Dict) -> Dict:
+        """GET an X API v2 endpoint through its pacer, waiting out rate limits"""
+        while True:
+            await self.api_pacers[endpoint].wait()
+            async with session.get(f"{API_BASE_URL}{path}", params=params) as response:
+                if response.status != 429:
+                    response.raise_for_status()
+                    return await response.json()
+                wait_time = self._rate_limit_wait(response.headers)
+            self.logger.warning(f"Rate limited on {path}, waiting {wait_time} seconds")
+            await asyncio.sleep(wait_time)
+    
+    async def resolve_user_ids(self, session, usernames: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Map lowercased usernames to user ids, up to 100 usernames per request
+        
+        Returns (user_ids, lookup_errors); lookup_errors maps lowercased usernames
+        that could not be looked up to the reason, so they are not reported as dead.
+        """
+        lookup_errors = {}
+        valid = []
+        for username in usernames:
+            if _USERNAME_RE.match(username):
+                valid.append(username)
+            else:
+                lookup_errors[username.lower()] = "Invalid username"
+        
+        chunks = [
+            valid[i:i + API_USERS_LOOKUP_BATCH]
+            for i in range(0, len(valid), API_USERS_LOOKUP_BATCH)
+        ]
+        responses = await asyncio.gather(*(
+            self.api_get(session, "users_lookup", "/users/by", {"usernames": ",".join(chunk)})
+            for chunk in chunks
+        ), return_exceptions=True)
+        
+        user_ids = {}
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"User lookup failed for {len(chunk)} users: {response}")
+                for username in chunk:
+                    lookup_errors[username.lower()] = f"User lookup failed: {response}"
+                continue
+            for user in response.get('data', []):
+                user_ids[user['username'].lower()] = user['id']
+        return user_ids, lookup_errors
+    
+    async def scrape_user_tweets_api(self, session, user_config: UserConfig,
+                                     user_id: Optional[str],
+                                     lookup_error: Optional[str] = None) -> ScrapingResult:
+        """Fetch a user's latest tweets from the X API instead of a browser"""
+        username = user_config.username
+        self.logger.info(f"Starting API fetch for @{username} ({user_config.tweet_count} tweets)")
+        
+        if lookup_error:
+            return ScrapingResult(
+                username=username,
+                success=False,
+                tweet_count=0,
+                error_message=lookup_error
+            )
+        
+        if user_id is None:
+            return ScrapingResult(
+                username=username,
+                success=False,
+                tweet_count=0,
+                error_message="Account doesn't exist or is suspended"
+            )
+        
+        try:
+            timeline = await self.api_get(session, "user_tweets", f"/users/{user_id}/tweets", {
+                "max_results": min(100, max(5, user_config.tweet_count)),
+                "tweet.fields": API_TWEET_FIELDS
+            })
+            scraped_at = datetime.now().isoformat()
+            tweets = [
+                self.tweet_from_api(username, tweet, scraped_at)
+                for tweet in timeline.get('data', [])[:user_config.tweet_count]
+            ]
+            if self.recent_only:
+                tweets = [t for t in tweets if self.is_recent_tweet(t, self.recent_cutoff_time)]
             
-            self.logger.info(f"Successfully scraped {len(tweets)} tweets for @{username}")
+            self.logger.info(f"Successfully fetched {len(tweets)} tweets for @{username}")
             
             return ScrapingResult(
                 username=username,
@@ -292,64 +579,169 @@ class EnterpriseTwitterScraper:
                 tweet_count=len(tweets),
                 tweets=tweets
             )
-            
+        
         except Exception as e:
-            self.logger.error(f"Error scraping @{username}: {e}")
+            self.logger.error(f"Error fetching @{username}: {e}")
             return ScrapingResult(
                 username=username,
                 success=False,
                 tweet_count=0,
                 error_message=str(e)
             )
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+    
+    @staticmethod
+    def tweet_from_api(username: str, tweet: Dict, scraped_at: str) -> Dict:
+        """Convert an API v2 tweet into the same shape the Selenium path produces"""
+        metrics = tweet.get('public_metrics') or {}
+        entities = tweet.get('entities') or {}
+        return {
+            'text': tweet.get('text', ''),
+            'created_at': tweet.get('created_at'),
+            'time_text': "",
+            'metrics': {
+                'replies': metrics.get('reply_count', 0),
+                'retweets': metrics.get('retweet_count', 0),
+                'likes': metrics.get('like_count', 0)
+            },
+            'scraped_at': scraped_at,
+            'url': f"https://x.com/{username}/status/{tweet['id']}",
+            'id': tweet['id'],
+            'hashtags': [tag['tag'] for tag in entities.get('hashtags', [])],
+            'mentions': [mention['username'] for mention in entities.get('mentions', [])]
+        }
+    
+    async def scrape_users_api(self, user_configs: List[UserConfig]) -> List[ScrapingResult]:
+        """Fetch all users concurrently over one pooled HTTP session"""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp not installed. Install with: pip install aiohttp")
+        if not self.bearer_token:
+            raise RuntimeError("The api method needs TWITTER_BEARER_TOKEN or --bearer-token")
+        
+        semaphore = asyncio.Semaphore(self.max_workers)
+        self.recent_cutoff_time = self.recent_cutoff()
+        self.api_pacers = {
+            "users_lookup": RequestPacer(API_USERS_LOOKUP_LIMIT, API_RATE_WINDOW),
+            "user_tweets": RequestPacer(API_USER_TWEETS_LIMIT, API_RATE_WINDOW)
+        }
+        
+        async def fetch(user_config: UserConfig) -> ScrapingResult:
+            key = user_config.username.lower()
+            async with semaphore:
+                result = await self.scrape_user_tweets_api(
+                    session, user_config, user_ids.get(key), lookup_errors.get(key)
+                )
+            self.record_result(result)
+            return result
+        
+        async with aiohttp.ClientSession(
+            headers={"Authorization": f"Bearer {self.bearer_token}"},
+            connector=aiohttp.TCPConnector(limit=self.max_workers * 4),
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as session:
+            # Resolve every username up front so each user costs a single timeline request
+            user_ids, lookup_errors = await self.resolve_user_ids(session, [u.username for u in user_configs])
+            return await asyncio.gather(*(fetch(user_config) for user_config in user_configs))
     
     def collect_tweets(self, driver: webdriver.Chrome, target_count: int, 
                       delay_range: tuple) -> List[Dict]:
         """Collect tweets from the current page"""
         tweets = []
-        last_height = 0
         scroll_attempts = 0
         max_scrolls = min(target_count // 5 + 5, 20)  # Limit scrolling
         
+        seen = set()
+        
         while len(tweets) < target_count and scroll_attempts < max_scrolls:
-            # Get current tweets
-            tweet_elements = driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
-            self.logger.info(f"Found {len(tweet_elements)} tweet elements on scroll {scroll_attempts + 1}")
+            # One timestamp for every tweet extracted on this scroll
+            scraped_at = datetime.now().isoformat()
+            
+            # Parse the whole page in-process with one driver call
+            page_tweets = self.extract_tweets_from_html(driver.page_source, scraped_at) if LexborHTMLParser else []
+            self.logger.info(f"Parsed {len(page_tweets)} tweets on scroll {scroll_attempts + 1}")
             
-            # Extract new tweets
-            for i, element in enumerate(tweet_elements[len(tweets):]):
+            if not page_tweets:
+                # Fall back to per-element extraction; every node is read and `seen` drops repeats
+                tweet_elements = driver.find_elements(By.CSS_SELECTOR, '[data-testid="tweet"]')
+                self.logger.info(f"Found {len(tweet_elements)} tweet elements on scroll {scroll_attempts + 1}")
+                page_tweets = (self.extract_tweet_data(element, scraped_at) for element in tweet_elements)
+            
+            # Keep tweets not collected on an earlier scroll
+            for tweet_data in page_tweets:
                 if len(tweets) >= target_count:
                     break
+                if not tweet_data:
+                    continue
                 
-                tweet_data = self.extract_tweet_data(element)
-                if tweet_data:
-                    tweets.append(tweet_data)
-                    self.logger.info(f"Successfully extracted tweet {len(tweets)}: {tweet_data['text'][:50]}...")
-                else:
-                    self.logger.debug(f"Failed to extract data from tweet element {i}")
+                key = tweet_data.get('id') or (tweet_data['text'], tweet_data['created_at'])
+                if key in seen:
+                    continue
+                seen.add(key)
+                if self.recent_only and not self.is_recent_tweet(tweet_data, self.recent_cutoff_time):
+                    continue
+                tweets.append(tweet_data)
+                self.logger.info(f"Successfully extracted tweet {len(tweets)}: {tweet_data['text'][:50]}...")
             
             # Scroll down
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            
-            # Wait for new content
-            time.sleep(random.uniform(*delay_range))
+            last_height = driver.execute_script(
+                "window.scrollTo(0, document.body.scrollHeight); return document.body.scrollHeight;"
+            )
             
-            # Check if new content loaded
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
+            # Wait only until new content grows the page, up to the delay ceiling
+            try:
+                WebDriverWait(driver, delay_range[1], poll_frequency=0.25).until(
+                    lambda d: d.execute_script("return document.body.scrollHeight") > last_height
+                )
+            except TimeoutException:
+                break  # No new content loaded
             
-            last_height = new_height
+            # Short jitter for timing variance, not for waiting
+            time.sleep(0.2 + random.random() * 0.3)
             scroll_attempts += 1
         
         return tweets[:target_count]
     
-    def extract_tweet_data(self, element) -> Optional[Dict]:
+    def extract_tweets_from_html(self, html: str, scraped_at: Optional[str] = None) -> List[Dict]:
+        """Extract every tweet from page HTML with selectolax, without driver round-trips"""
+        scraped_at = scraped_at or datetime.now().isoformat()
+        tweets = []
+        
+        for node in LexborHTMLParser(html).css('[data-testid="tweet"]'):
+            text_node = node.css_first('[data-testid="tweetText"]')
+            if text_node:
+                # Drop hidden t.co / ellipsis spans so text matches Selenium's visible .text
+                for hidden in text_node.css('[aria-hidden="true"]'):
+                    hidden.decompose()
+            text = text_node.text(deep=True, separator='').strip() if text_node else ""
+            # Skip if no text (like advanced scraper)
+            if not text:
+                continue
+            
+            time_node = node.css_first('time')
+            metrics = {'replies': 0, 'retweets': 0, 'likes': 0}
+            for testid, metric in METRIC_TESTIDS.items():
+                metric_node = node.css_first(f'[data-testid="{testid}"]')
+                if metric_node:
+                    metrics[metric] = self.extract_number_from_text(metric_node.attributes.get('aria-label') or "")
+            
+            link_node = node.css_first('a[href*="/status/"]')
+            href = (link_node.attributes.get('href') or "") if link_node else ""
+            
+            tags = _TAG_RE.findall(text)
+            tweets.append({
+                'text': text,
+                'created_at': time_node.attributes.get('datetime') if time_node else None,
+                'time_text': time_node.text() if time_node else "",
+                'metrics': metrics,
+                'scraped_at': scraped_at,
+                'url': urljoin("https://x.com", href) if href else "",
+                'id': href.split('/status/')[-1].split('?')[0].split('/')[0] if href else "",
+                'hashtags': [name for sigil, name in tags if sigil == '#'],
+                'mentions': [name for sigil, name in tags if sigil == '@']
+            })
+        
+        return tweets
+    
+    def extract_tweet_data(self, element, scraped_at: Optional[str] = None) -> Optional[Dict]:
         """Extract data from a tweet element"""
         try:
             tweet_data = {}
@@ -388,7 +780,7 @@ class EnterpriseTwitterScraper:
                 pass
             
             tweet_data['metrics'] = metrics
-            tweet_data['scraped_at'] = datetime.now().isoformat()
+            tweet_data['scraped_at'] = scraped_at or datetime.now().isoformat()
             
             # Skip if no text (like advanced scraper)
             if not tweet_data['text']:
@@ -409,14 +801,10 @@ class EnterpriseTwitterScraper:
                 tweet_data['url'] = ""
                 tweet_data['id'] = ""
             
-            # Extract hashtags and mentions like advanced scraper
-            if tweet_data['text']:
-                words = tweet_data['text'].split()
-                tweet_data['hashtags'] = [word[1:] for word in words if word.startswith('#')]
-                tweet_data['mentions'] = [word[1:] for word in words if word.startswith('@')]
-            else:
-                tweet_data['hashtags'] = []
-                tweet_data['mentions'] = []
+            # Extract hashtags and mentions in one regex pass (text is non-empty here)
+            tags = _TAG_RE.findall(tweet_data['text'])
+            tweet_data['hashtags'] = [name for sigil, name in tags if sigil == '#']
+            tweet_data['mentions'] = [name for sigil, name in tags if sigil == '@']
             
             return tweet_data
             
@@ -426,35 +814,38 @@ class EnterpriseTwitterScraper:
     
     def extract_number_from_text(self, text: str) -> int:
         """Extract number from text (e.g., '1.2K' -> 1200)"""
-        import re
+        if not text:
+            return 0
         
-        # Remove non-numeric characters except K, M, B
-        clean_text = re.sub(r'[^0-9KMB.]', '', text.upper())
+        # Fast path: aria-labels usually look like "1,234 Likes. Like"
+        try:
+            return int(text.split(' ', 1)[0].replace(',', ''))
+        except ValueError:
+            pass
         
-        if not clean_text:
+        match = _NUMBER_RE.search(text)
+        if not match:
             return 0
         
+        number, suffix = match.groups()
         try:
-            if 'K' in clean_text:
-                return int(float(clean_text.replace('K', '')) * 1000)
-            elif 'M' in clean_text:
-                return int(float(clean_text.replace('M', '')) * 1000000)
-            elif 'B' in clean_text:
-                return int(float(clean_text.replace('B', '')) * 1000000000)
-            else:
-                return int(float(clean_text))
-        except:
+            return int(float(number.replace(',', '')) * _SUFFIX_MULTIPLIERS[suffix.upper()])
+        except ValueError:
             return 0
     
-    def is_recent_tweet(self, tweet_data: Dict) -> bool:
+    @staticmethod
+    def recent_cutoff() -> datetime:
+        """Naive UTC time 24 hours ago; compute once per batch and pass to is_recent_tweet"""
+        return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=24)
+    
+    def is_recent_tweet(self, tweet_data: Dict, cutoff_time: Optional[datetime] = None) -> bool:
         """Check if tweet is from the last 24 hours"""
         if not tweet_data.get('created_at'):
             return True  # Include if we can't determine age
         
         try:
-            tweet_time = datetime.fromisoformat(tweet_data['created_at'].replace('Z', '+00:00'))
-            cutoff_time = datetime.now() - timedelta(hours=24)
-            return tweet_time.replace(tzinfo=None) > cutoff_time
+            tweet_time = parse_timestamp(tweet_data['created_at'])
+            return tweet_time.replace(tzinfo=None) > (cutoff_time or self.recent_cutoff())
         except:
             return True  # Include if parsing fails
     
@@ -462,10 +853,10 @@ class EnterpriseTwitterScraper:
         """Process a batch of users concurrently"""
         results = []
         
-        # Determine optimal worker count for this batch
-        batch_workers = min(self.max_workers, len(user_configs))
+        # Reuse the run's executor; a one-off pool is only made when called directly
+        executor = self.executor or ThreadPoolExecutor(max_workers=min(self.max_workers, len(user_configs)))
         
-        with ThreadPoolExecutor(max_workers=batch_workers) as executor:
+        try:
             # Submit all tasks
             future_to_user = {
                 executor.submit(self.scrape_user_tweets, user_config, delay_range): user_config
@@ -477,56 +868,128 @@ class EnterpriseTwitterScraper:
                 user_config = future_to_user[future]
                 try:
                     result = future.result()
-                    results.append(result)
-                    
-                    if result.success:
-                        self.success_count += 1
-                        self.total_tweets += result.tweet_count
-                    else:
-                        self.error_count += 1
-                        
                 except Exception as e:
                     self.logger.error(f"Task failed for @{user_config.username}: {e}")
-                    self.error_count += 1
-                    results.append(ScrapingResult(
+                    result = ScrapingResult(
                         username=user_config.username,
                         success=False,
                         tweet_count=0,
                         error_message=str(e)
-                    ))
+                    )
+                
+                results.append(result)
+                self.record_result(result)
+        finally:
+            if executor is not self.executor:
+                executor.shutdown()
+                # No scrape run owns the pool, so release its Chrome processes here
+                self.close_pool()
         
         return results
     
-    def scrape_users(self, user_configs: List[UserConfig]) -> List[ScrapingResult]:
+    def record_result(self, result: ScrapingResult, checkpoint: bool = True):
+        """Update counters and append the result to the checkpoint file"""
+        if result.success:
+            self.success_count += 1
+            self.total_tweets += result.tweet_count
+        else:
+            self.error_count += 1
+        
+        if checkpoint and self._checkpoint:
+            self._checkpoint.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+    
+    def load_checkpoint(self) -> Dict[str, ScrapingResult]:
+        """Read the latest checkpointed result per user (keyed by lowercased username)"""
+        results = {}
+        if not self.checkpoint_path.exists():
+            return results
+        
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = ScrapingResult(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue  # Torn last line from a crash
+                results[result.username.lower()] = result
+        return results
+    
+    def scrape_users(self, user_configs: List[UserConfig], resume: bool = False) -> List[ScrapingResult]:
+        """Scrape users, checkpointing each one; resume skips checkpointed successes"""
+        previous = []
+        if resume:
+            wanted = {u.username.lower() for u in user_configs}
+            previous = [
+                result for key, result in self.load_checkpoint().items()
+                if result.success and key in wanted
+            ]
+            done = {result.username.lower() for result in previous}
+            user_configs = [u for u in user_configs if u.username.lower() not in done]
+            for result in previous:
+                self.record_result(result, checkpoint=False)
+            self.logger.info(f"Resuming: {len(previous)} users already done, {len(user_configs)} remaining")
+        
+        # Line-buffered: each result reaches the file as it is recorded, on both the browser and API paths
+        self._checkpoint = open(self.checkpoint_path, 'a' if resume else 'w', encoding='utf-8', buffering=1)
+        try:
+            if self.method == "api":
+                # No browsers to protect, so concurrency is bounded by max_workers alone
+                self.logger.info(f"Fetching {len(user_configs)} users through the X API with {self.max_workers} workers")
+                results = list(asyncio.run(self.scrape_users_api(user_configs))) if user_configs else []
+            else:
+                results = self.scrape_batches(user_configs)
+        finally:
+            self._checkpoint.close()
+            self._checkpoint = None
+        
+        return previous + results
+    
+    def scrape_batches(self, user_configs: List[UserConfig]) -> List[ScrapingResult]:
         """Scrape tweets for multiple users with optimal batching"""
         total_users = len(user_configs)
+        if not total_users:
+            return []
+        
         batch_size = self.calculate_optimal_batch_size(total_users)
         delay_range = self.calculate_delay_range(total_users)
         
-        self.logger.info(f"Processing {total_users} users in batches of {batch_size}")
+        # Batches start at the computed size and adapt to the error rate as they run
+        self.dynamic_batch_size = batch_size
+        max_batch_size = max(batch_size, self.max_workers) * 2
+        
+        self.logger.info(f"Processing {total_users} users in batches of {batch_size} (adaptive, max {max_batch_size})")
         self.logger.info(f"Using delay range: {delay_range[0]:.1f}-{delay_range[1]:.1f} seconds")
         
         all_results = []
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
         
-        # Process in batches
-        for i in range(0, total_users, batch_size):
-            batch = user_configs[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (total_users + batch_size - 1) // batch_size
-            
-            self.logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} users)")
-            
-            batch_results = self.process_batch(batch, delay_range)
-            all_results.extend(batch_results)
-            
-            # Progress update
-            self.logger.info(f"Batch {batch_num} complete. Success: {self.success_count}, Errors: {self.error_count}")
-            
-            # Inter-batch delay for large sets
-            if total_users > 100 and batch_num < total_batches:
-                inter_batch_delay = min(10, total_users / 1000)
-                self.logger.info(f"Inter-batch delay: {inter_batch_delay:.1f} seconds")
-                time.sleep(inter_batch_delay)
+        try:
+            # Process in batches
+            i = 0
+            batch_num = 0
+            while i < total_users:
+                batch = user_configs[i:i + self.dynamic_batch_size]
+                i += len(batch)
+                batch_num += 1
+                
+                self.logger.info(f"Processing batch {batch_num} ({len(batch)} users, {total_users - i} remaining)")
+                self.recent_cutoff_time = self.recent_cutoff()
+                
+                batch_results = self.process_batch(batch, delay_range)
+                all_results.extend(batch_results)
+                self.dynamic_batch_size = self.adapt_batch_size(batch_results, max_batch_size)
+                
+                # Progress update
+                self.logger.info(f"Batch {batch_num} complete. Success: {self.success_count}, Errors: {self.error_count}")
+                
+                # Inter-batch delay for large sets
+                if total_users > 100 and i < total_users:
+                    inter_batch_delay = min(10, total_users / 1000)
+                    self.logger.info(f"Inter-batch delay: {inter_batch_delay:.1f} seconds")
+                    time.sleep(inter_batch_delay)
+        finally:
+            self.executor.shutdown()
+            self.executor = None
+            self.close_pool()
         
         return all_results
     
@@ -542,64 +1005,51 @@ class EnterpriseTwitterScraper:
             raise ValueError(f"Unsupported format: {format}")
     
     def save_json_results(self, results: List[ScrapingResult], output_path: Path):
-        """Save results as JSON"""
-        json_data = {
-            'metadata': {
-                'total_users': len(results),
-                'successful_scrapes': self.success_count,
-                'failed_scrapes': self.error_count,
-                'total_tweets': self.total_tweets,
-                'scraped_at': datetime.now().isoformat()
-            },
-            'results': [asdict(result) for result in results]
+        """Save results as JSON, streaming one result at a time"""
+        metadata = {
+            'total_users': len(results),
+            'successful_scrapes': self.success_count,
+            'failed_scrapes': self.error_count,
+            'total_tweets': self.total_tweets,
+            'scraped_at': datetime.now().isoformat()
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
+        # Only one result is ever converted to dicts at a time; the large buffer batches the writes
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write('{\n  "metadata": ')
+            json.dump(metadata, f, ensure_ascii=False)
+            f.write(',\n  "results": [\n')
+            for i, result in enumerate(results):
+                if i:
+                    f.write(',\n')
+                json.dump(result.to_dict(), f, ensure_ascii=False)
+            f.write('\n  ]\n}\n')
         
         self.logger.info(f"Results saved to {output_path}")
     
     def save_csv_results(self, results: List[ScrapingResult], output_path: Path):
-        """Save results as CSV"""
-        # Flatten results for CSV
-        csv_rows = []
-        
-        for result in results:
-            if result.tweets:
-                for tweet in result.tweets:
-                    row = {
-                        'username': result.username,
-                        'success': result.success,
-                        'scraped_at': result.scraped_at,
-                        'tweet_text': tweet.get('text', ''),
-                        'tweet_created_at': tweet.get('created_at', ''),
-                        'tweet_time_text': tweet.get('time_text', ''),
-                        'replies': tweet.get('metrics', {}).get('replies', 0),
-                        'retweets': tweet.get('metrics', {}).get('retweets', 0),
-                        'likes': tweet.get('metrics', {}).get('likes', 0)
-                    }
-                    csv_rows.append(row)
-            else:
-                # Add row for failed scrapes
-                row = {
-                    'username': result.username,
-                    'success': result.success,
-                    'scraped_at': result.scraped_at,
-                    'error_message': result.error_message,
-                    'tweet_text': '',
-                    'tweet_created_at': '',
-                    'tweet_time_text': '',
-                    'replies': 0,
-                    'retweets': 0,
-                    'likes': 0
-                }
-                csv_rows.append(row)
-        
-        if csv_rows:
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=csv_rows[0].keys())
-                writer.writeheader()
-                writer.writerows(csv_rows)
+        """Save results as CSV, writing rows as they are flattened"""
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            
+            for result in results:
+                if result.tweets:
+                    for tweet in result.tweets:
+                        metrics = tweet.get('metrics') or {}
+                        writer.writerow((
+                            result.username, result.success, result.scraped_at,
+                            tweet.get('text', ''), tweet.get('created_at', ''), tweet.get('time_text', ''),
+                            metrics.get('replies', 0), metrics.get('retweets', 0), metrics.get('likes', 0),
+                            ''
+                        ))
+                else:
+                    # Add row for failed scrapes
+                    writer.writerow((
+                        result.username, result.success, result.scraped_at,
+                        '', '', '', 0, 0, 0,
+                        result.error_message or ''
+                    ))
         
         self.logger.info(f"CSV results saved to {output_path}")
 
@@ -636,6 +1086,11 @@ def main():
     parser.add_argument('--workers', type=int, help='Maximum concurrent workers')
     parser.add_argument('--tweet-count', type=int, default=10, help='Tweets per user (for txt input)')
     parser.add_argument('--headless', action='store_true', default=True, help='Run in headless mode')
+    parser.add_argument('--method', choices=['selenium', 'api'], default='selenium',
+                       help='Scrape with Chrome or fetch from the X API v2 (needs a bearer token)')
+    parser.add_argument('--bearer-token', help='X API bearer token (default: TWITTER_BEARER_TOKEN)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Skip users already scraped successfully in the checkpoint of an interrupted run')
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], 
                        default='INFO', help='Logging level')
     
@@ -663,12 +1118,14 @@ def main():
     scraper = EnterpriseTwitterScraper(
         max_workers=args.workers,
         headless=args.headless,
-        log_level=args.log_level
+        log_level=args.log_level,
+        method=args.method,
+        bearer_token=args.bearer_token
     )
     
     # Start scraping
     start_time = datetime.now()
-    results = scraper.scrape_users(user_configs)
+    results = scraper.scrape_users(user_configs, resume=args.resume)
     end_time = datetime.now()
     
     # Save results